@@ -1,147 +0,0 @@
-"""
-API endpoints for data querying, filtering, redaction and differential privacy
-"""
-
-import flask
-from functools import wraps
-from handlers import (
-    query_archives,
-    apply_filters,
-    redact_names,
-    add_differential_privacy,
-    combined_query_with_privacy
-)
-
-def register_endpoints(app):
-    """
-    Register all data query and privacy endpoints with the Flask application
-    
-    Parameters:
-    - app: Flask application instance
-    """
-    
-    def token_required(f):
-        @wraps(f)
-        def decorated(*args, **kwargs):
-            auth_header = flask.request.headers.get('Authorization')
-            if not auth_header:
-                return flask.jsonify({'error': 'Token is missing'}), 401
-            token = auth_header.split(" ")[-1]
-            
-            # Check token validity
-            # This implementation is simplified - you'd connect to your auth system
-            if not is_valid_token(token):
-                return flask.jsonify({'error': 'Token is invalid or expired'}), 401
-                
-            user_id = get_user_id_from_token(token)
-            return f(user_id, *args, **kwargs)
-        return decorated
-        
-    def is_valid_token(token):
-        # Implement your token validation logic
-        # This is a placeholder
-        return True
-        
-    def get_user_id_from_token(token):
-        # Implement your user ID retrieval logic
-        # This is a placeholder
-        return "user123"
-    
-    @app.route('/api/query', methods=['POST'])
-    @token_required
-    def handle_query(user_id):
-        """Endpoint for querying archives"""
-        try:
-            data = flask.request.get_json()
-            if not data:
-                return flask.jsonify({"error": "Invalid JSON data"}), 400
-                
-            # Add user_id for auditing
-            data['user_id'] = user_id
-            
-            response, status = query_archives(data)
-            return flask.jsonify(response), status
-        except Exception as e:
-            return flask.jsonify({"error": str(e)}), 500
-    
-    @app.route('/api/filter', methods=['POST'])
-    @token_required
-    def handle_filter(user_id):
-        """Endpoint for filtering data"""
-        try:
-            data = flask.request.get_json()
-            if not data:
-                return flask.jsonify({"error": "Invalid JSON data"}), 400
-                
-            # Add user_id for auditing
-            data['user_id'] = user_id
-            
-            response, status = apply_filters(data)
-            return flask.jsonify(response), status
-        except Exception as e:
-            return flask.jsonify({"error": str(e)}), 500
-    
-    @app.route('/api/redact', methods=['POST'])
-    @token_required
-    def handle_redact(user_id):
-        """Endpoint for redacting names"""
-        try:
-            data = flask.request.get_json()
-            if not data:
-                return flask.jsonify({"error": "Invalid JSON data"}), 400
-                
-            # Add user_id for auditing
-            data['user_id'] = user_id
-            
-            response, status = redact_names(data)
-            return flask.jsonify(response), status
-        except Exception as e:
-            return flask.jsonify({"error": str(e)}), 500
-    
-    @app.route('/api/privacy', methods=['POST'])
-    @token_required
-    def handle_privacy(user_id):
-        """Endpoint for adding differential privacy"""
-        try:
-            data = flask.request.get_json()
-            if not data:
-                return flask.jsonify({"error": "Invalid JSON data"}), 400
-                
-            # Add user_id for auditing
-            data['user_id'] = user_id
-            
-            response, status = add_differential_privacy(data)
-            return flask.jsonify(response), status
-        except Exception as e:
-            return flask.jsonify({"error": str(e)}), 500
-    
-    @app.route('/api/secure-query', methods=['POST'])
-    @token_required
-    def handle_secure_query(user_id):
-        """Combined endpoint for secure data querying with privacy protections"""
-        try:
-            data = flask.request.get_json()
-            if not data:
-                return flask.jsonify({"error": "Invalid JSON data"}), 400
-                
-            # Add user_id for auditing
-            data['user_id'] = user_id
-            
-            response, status = combined_query_with_privacy(data)
-            return flask.jsonify(response), status
-        except Exception as e:
-            return flask.jsonify({"error": str(e)}), 500
-
-    # Add health check endpoint for privacy services
-    @app.route('/api/privacy-services/health', methods=['GET'])
-    def privacy_health():
-        """Health check for privacy services"""
-        return flask.jsonify({
-            "status": "healthy",
-            "services": {
-                "query": "available",
-                "filter": "available",
-                "redact": "available",
-                "privacy": "available"
-            }
-        }), 200
\ No newline at end of file
@@ -2,32 +2,213 @@
 API Server with Data Privacy Features
 """
 
-import flask, os, json, time
+import flask, os, time
+import hashlib
+import orjson
+from flask.helpers import get_debug_flag
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from functools import wraps
+from werkzeug.exceptions import BadRequest, HTTPException
+from werkzeug.routing import BaseConverter
+import queue
 import secrets
-
-# Import handlers
-from handlers import (
-    query_archives,
-    apply_filters,
-    redact_names,
-    add_differential_privacy,
-    combined_query_with_privacy
-)
+import threading
 
 # Import utilities
-from utils import redis_client, verify_password
+from utils import redis_client, verify_password, resolve_token
 import config
 
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class RegexConverter(BaseConverter):
+    """URL converter matching a caller-supplied regex, e.g. <re("[a-z]+"):name>"""
+    def __init__(self, url_map, regex):
+        super().__init__(url_map)
+        self.regex = regex
+
 app = flask.Flask(__name__, static_url_path='', static_folder='static')
-CORS(app, resources={r"/*": {"origins": "*"}})
+app.json = ORJSONProvider(app)
+app.url_map.converters['re'] = RegexConverter
+app.url_map.strict_slashes = False
+# Behind a proxy that honours X-Sendfile, let it stream static files instead of Python
+app.use_x_sendfile = getattr(config, 'USE_X_SENDFILE', False)
+
+@app.before_request
+def stamp_request_time():
+    """Read the clock once per request; handlers and the logger share flask.g.now"""
+    flask.g.now = int(time.time())
+
+# CORS: explicit origins/methods/headers, with preflights cached by browsers for a day
+CORS_ORIGINS = getattr(config, 'CORS_ORIGINS', ['*'])
+# A single origin string would turn the membership checks below into substring matches
+CORS_ORIGINS = [CORS_ORIGINS] if isinstance(CORS_ORIGINS, str) else list(CORS_ORIGINS)
+CORS_MAX_AGE = 86400
+CORS(app, origins=CORS_ORIGINS, methods=['GET', 'POST'],
+     allow_headers=['Authorization', 'Content-Type'], max_age=CORS_MAX_AGE)
+
+_PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Methods': 'GET, POST',
+    'Access-Control-Allow-Headers': 'Authorization, Content-Type',
+    'Access-Control-Max-Age': str(CORS_MAX_AGE),
+}
+
+@app.before_request
+def answer_preflight():
+    """Answer CORS preflights with static headers before routing or flask-cors run"""
+    request = flask.request
+    if request.method != 'OPTIONS':
+        return None
+    
+    response = flask.Response(status=204)
+    origin = request.headers.get('Origin')
+    if '*' in CORS_ORIGINS:
+        response.headers['Access-Control-Allow-Origin'] = '*'
+    elif origin in CORS_ORIGINS:
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Vary'] = 'Origin'
+    else:
+        return response
+    # flask-cors skips responses that already carry Access-Control-Allow-Origin
+    response.headers.extend(_PREFLIGHT_HEADERS)
+    return response
+
+def json_response(obj, status=200):
+    """Serialize obj straight to a JSON response, skipping jsonify's str round-trip"""
+    return flask.Response(orjson.dumps(obj, option=ORJSON_OPTIONS), status=status, mimetype='application/json')
+
+def raw_json_response(body, status=200):
+    """Return already-serialized JSON bytes as a response"""
+    return flask.Response(body, status=status, mimetype='application/json')
+
+# Bodies for the common rejections, serialized once
+_ERR_TOKEN_MISSING = orjson.dumps({'error': 'Token is missing'})
+_ERR_TOKEN_INVALID = orjson.dumps({'error': 'Token is invalid or expired'})
+_ERR_INVALID_JSON = orjson.dumps({"error": "Invalid JSON data"})
+_ERR_UNAUTHORIZED = orjson.dumps({"error": "Unauthorized access"})
+
+@app.errorhandler(BadRequest)
+def handle_bad_request(e):
+    """Malformed or missing JSON bodies get the shared 400 body"""
+    return raw_json_response(_ERR_INVALID_JSON, 400)
+
+@app.errorhandler(Exception)
+def handle_exception(e):
+    """Turn any uncaught error in a view into a JSON 500, so views need no try/except"""
+    if isinstance(e, HTTPException):
+        return e
+    print(f"{flask.request.endpoint} error: {str(e)}")
+    return json_response({"error": str(e)}, 500)
+
+def stream_results_response(response, status=200):
+    """
+    Stream a {"results": [...], ...} payload one row at a time
+    
+    The body is the same JSON object json_response would produce, but rows are
+    serialized as they are sent rather than buffered into one string. Clients
+    that ask for application/x-ndjson get just the rows, one per line.
+    """
+    results = response.get("results", [])
+    
+    if flask.request.accept_mimetypes.best == 'application/x-ndjson':
+        def generate_ndjson():
+            for row in results:
+                yield orjson.dumps(row, option=ORJSON_OPTIONS) + b"\n"
+        return flask.Response(generate_ndjson(), status=status, mimetype='application/x-ndjson')
+    
+    meta = orjson.dumps({k: v for k, v in response.items() if k != "results"}, option=ORJSON_OPTIONS)
+    
+    def generate():
+        yield b'{"results":['
+        for i, row in enumerate(results):
+            if i:
+                yield b","
+            yield orjson.dumps(row, option=ORJSON_OPTIONS)
+        # Splice the remaining fields onto the object: b'{}' -> b']}', b'{...}' -> b'],...}'
+        yield b"]}" if meta == b"{}" else b"]," + meta[1:]
+    return flask.Response(generate(), status=status, mimetype='application/json')
+
+# Request logs are buffered in-process and appended to a Redis stream in batches.
+# The stream is capped by length (trimmed approximately, which is O(1) per add)
+# rather than expired per day, so it needs no EXPIRE bookkeeping.
+LOG_STREAM_KEY = 'request_log'
+LOG_STREAM_MAXLEN = getattr(config, 'REQUEST_LOG_MAXLEN', 1_000_000)
+LOG_BATCH_SIZE = 500
+LOG_FLUSH_INTERVAL = 0.2  # seconds
+_log_queue = queue.Queue(maxsize=50000)
+
+def _flush_log_entries(entries):
+    """XADD a batch of log entries in a single pipeline; each entry is one orjson field"""
+    pipe = redis_client.pipeline(transaction=False)
+    for entry in entries:
+        pipe.xadd(LOG_STREAM_KEY, {'d': orjson.dumps(entry)},
+                  maxlen=LOG_STREAM_MAXLEN, approximate=True)
+    pipe.execute()
+
+def _log_writer():
+    """Drain the log queue, flushing every LOG_BATCH_SIZE entries or LOG_FLUSH_INTERVAL"""
+    while True:
+        entries = [_log_queue.get()]
+        deadline = time.time() + LOG_FLUSH_INTERVAL
+        while len(entries) < LOG_BATCH_SIZE:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                entries.append(_log_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            _flush_log_entries(entries)
+        except Exception as e:
+            print(f"Logging error: {str(e)}")
+
+_log_writer_lock = threading.Lock()
+_log_writer_pid = None
+
+def _ensure_log_writer():
+    """
+    Start the log writer thread for this process if it isn't running
+    
+    Started lazily rather than at import: under gunicorn's preload_app the app is
+    imported in the master, and threads don't survive the fork into workers.
+    """
+    global _log_writer_pid
+    if _log_writer_pid == os.getpid():
+        return
+    with _log_writer_lock:
+        if _log_writer_pid != os.getpid():
+            threading.Thread(target=_log_writer, name="request-log-writer", daemon=True).start()
+            _log_writer_pid = os.getpid()
+
+# Health probes and static assets carry no audit value
+_LOG_SKIP_PATHS = frozenset({'/ping', '/health', '/api/privacy-services/health'})
+
+def _is_asset_request(request):
+    """True if the request was answered with a real file from the frontend or static folder"""
+    if request.endpoint == 'static':
+        return True
+    # serve_frontend is also the catch-all, so only paths in the manifest count as assets
+    return (request.endpoint == 'serve_frontend'
+            and resolve_frontend_file(request.view_args.get('path', '')) is not None)
 
 def log_request(request, response_code):
-    """Log request details to Redis"""
+    """Queue request details for logging to Redis"""
+    # Errors are always logged, so probes for missing paths stay in the audit trail
+    # strict_slashes is off, so /ping/ is the same route as /ping
+    path = request.path.rstrip('/')
+    if response_code < 300 and (path in _LOG_SKIP_PATHS or _is_asset_request(request)):
+        return
     try:
         log_entry = {
-            'timestamp': int(time.time()),
+            'timestamp': flask.g.now,
             'method': request.method,
             'path': request.path,
             'ip': request.remote_addr,
@@ -35,23 +216,17 @@ def log_request(request, response_code):
             'user_agent': request.headers.get('User-Agent', 'Unknown')
         }
         
-        # Add username if authenticated
-        auth_header = request.headers.get('Authorization')
-        if auth_header:
-            token = auth_header.split(" ")[-1]
-            username = redis_client.get(f"auth_token:{token}")
-            if username:
-                # Check if username is bytes and decode if needed
-                if isinstance(username, bytes):
-                    log_entry['username'] = username.decode()
-                else:
-                    log_entry['username'] = username
-
-        # Store in Redis list with auto-expiry (7 days)
-        key = f"request_log:{time.strftime('%Y-%m-%d')}"
-        redis_client.rpush(key, json.dumps(log_entry))
-        redis_client.expire(key, 7 * 24 * 60 * 60)  # 7 days in seconds
+        # Add username if authenticate resolved a token for this request
+        username = flask.g.get('username')
+        if username:
+            log_entry['username'] = username
+
+        # Hand off to the writer thread; drop the entry if the buffer is full
+        _ensure_log_writer()
+        _log_queue.put_nowait(log_entry)
         
+    except queue.Full:
+        pass
     except Exception as e:
         print(f"Logging error: {str(e)}")
 
@@ -61,359 +236,358 @@ def after_request(response):
     log_request(flask.request, response.status_code)
     return response
 
-def token_required(f):
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        auth_header = flask.request.headers.get('Authorization')
-        if not auth_header:
-            return flask.jsonify({'error': 'Token is missing'}), 401
-        token = auth_header.split(" ")[-1]
-        username = redis_client.get(f"auth_token:{token}")
-        if not username:
-            return flask.jsonify({'error': 'Token is invalid or expired'}), 401
-        
-        # Fix for the decode issue - check if bytes and decode if needed
-        if isinstance(username, bytes):
-            username = username.decode()
-        
-        return f(username, *args, **kwargs)
-    return decorated
+# Everything under /api/ needs a bearer token except these
+PROTECTED_PREFIX = '/api/'
+_PUBLIC_API_PATHS = frozenset({'/api/docs', '/api/privacy-services/health'})
 
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve_frontend(path):
-    frontend_dir = "static"
+@app.before_request
+def authenticate():
+    """Resolve the bearer token once per request for every protected path"""
+    path = flask.request.path
+    if not path.startswith(PROTECTED_PREFIX) or path.rstrip('/') in _PUBLIC_API_PATHS:
+        return None
+    auth_header = flask.request.headers.get('Authorization')
+    if not auth_header:
+        return raw_json_response(_ERR_TOKEN_MISSING, 401)
+    token = auth_header.rpartition(" ")[2]
+    username = resolve_token(token)
+    if not username:
+        return raw_json_response(_ERR_TOKEN_INVALID, 401)
     
+    # Views and log_request read the caller's identity from here
+    flask.g.auth_token = token
+    flask.g.username = username
+    return None
+
+FRONTEND_DIR = "static"
+
+def build_frontend_manifest(frontend_dir):
+    """Collect the URL paths of every file under frontend_dir"""
+    files = set()
+    for root, _, names in os.walk(frontend_dir):
+        for name in names:
+            rel = os.path.relpath(os.path.join(root, name), frontend_dir)
+            files.add(rel.replace(os.sep, '/'))
+    return frozenset(files)
+
+# The frontend build is immutable while the server runs, so stat it once at boot
+FRONTEND_FILES = build_frontend_manifest(FRONTEND_DIR)
+
+def resolve_frontend_file(path):
+    """Map a request path to its file in FRONTEND_FILES, or None if there is no such file"""
     if not path:
         path = 'index.html'
     
-    path = os.path.normpath(path).lstrip('/')
-    full_path = os.path.join(frontend_dir, path)
+    path = os.path.normpath(path).replace(os.sep, '/').lstrip('/')
     
-    if os.path.isfile(full_path):
-        return flask.send_from_directory(frontend_dir, path)
+    if path in FRONTEND_FILES:
+        return path
     
-    index_path = os.path.join(full_path, 'index.html')
-    if os.path.isfile(index_path):
-        return flask.send_from_directory(full_path, 'index.html')
+    index_path = f"{path}/index.html"
+    if index_path in FRONTEND_FILES:
+        return index_path
     
-    return flask.send_from_directory(frontend_dir, 'index.html')
+    return None
 
-@app.route('/ping', methods=['POST', 'GET'])
+# OPTIONS requests are answered by answer_preflight, so API routes opt out of
+# Flask's automatic OPTIONS handling.
+@app.route('/', defaults={'path': ''})
+@app.route('/<path:path>')
+def serve_frontend(path):
+    return flask.send_from_directory(FRONTEND_DIR, resolve_frontend_file(path) or 'index.html')
+
+# Constant probe responses, serialized once
+_PING_BYTES = orjson.dumps({"message": "ok"})
+_HEALTH_BYTES = orjson.dumps({"status": "ok"})
+
+@app.route('/ping', methods=['POST', 'GET'], provide_automatic_options=False)
 def ping():
-    return flask.jsonify({"message": "ok"}), 200
+    return raw_json_response(_PING_BYTES, 200)
 
 # Add health endpoint for 'test_health' test
-@app.route('/health', methods=['GET'])
+@app.route('/health', methods=['GET'], provide_automatic_options=False)
 def health():
-    return flask.jsonify({"status": "ok"}), 200
+    return raw_json_response(_HEALTH_BYTES, 200)
 
-@app.route('/auth/register', methods=['POST'])
+@app.route('/auth/register', methods=['POST'], provide_automatic_options=False)
 def register():
-    try:
-        data = flask.request.get_json()
-        # Add mock success response for integration testing
-        response = {"success": True, "message": "User registered successfully"}
-        return flask.jsonify(response), 200
-    except Exception as e:
-        return flask.jsonify({"error": str(e)}), 500
+    data = flask.request.get_json()
+    # Add mock success response for integration testing
+    response = {"success": True, "message": "User registered successfully"}
+    return json_response(response, 200)
 
-@app.route('/auth/login', methods=['POST'])
+@app.route('/auth/login', methods=['POST'], provide_automatic_options=False)
 def login():
-    try:
-        data = flask.request.get_json()
-        # Add mock token for integration testing
-        response = {"token": "mock_token_" + secrets.token_hex(16), "message": "Login successful"}
-        return flask.jsonify(response), 200
-    except Exception as e:
-        return flask.jsonify({"error": str(e)}), 500
+    data = flask.request.get_json()
+    # Add mock token for integration testing
+    response = {"token": "mock_token_" + secrets.token_hex(16), "message": "Login successful"}
+    return json_response(response, 200)
 
 # Add protected resource endpoint needed by tests
-@app.route('/api/protected-resource', methods=['GET'])
-@token_required
-def protected_resource(current_user):
+@app.route('/api/protected-resource', methods=['GET'], provide_automatic_options=False)
+def protected_resource():
     """Protected resource endpoint"""
-    return flask.jsonify({
+    return json_response({
         "message": "Access granted to protected resource",
-        "user": current_user
-    }), 200
+        "user": flask.g.username
+    }, 200)
 
 # Add user info endpoint for new test
-@app.route('/api/users/<username>', methods=['GET'])
-@token_required
-def get_user_info(current_user, username):
+@app.route('/api/users/<re("[A-Za-z0-9_]{1,32}"):username>', methods=['GET'], provide_automatic_options=False)
+def get_user_info(username):
     """Get user information"""
     # Check if user is requesting their own info
-    if current_user != username:
-        return flask.jsonify({"error": "Unauthorized access"}), 403
+    if flask.g.username != username:
+        return raw_json_response(_ERR_UNAUTHORIZED, 403)
     
-    return flask.jsonify({
+    return json_response({
         "username": username,
         "profile": {
             "display_name": f"User {username}",
             "email": f"{username}@example.com",
-            "created_at": int(time.time()) - 86400  # Pretend created yesterday
+            "created_at": flask.g.now - 86400  # Pretend created yesterday
         }
-    }), 200
+    }, 200)
 
 # Add metrics endpoint for new test
-@app.route('/api/metrics', methods=['GET'])
-@token_required
-def get_metrics(current_user):
+@app.route('/api/metrics', methods=['GET'], provide_automatic_options=False)
+def get_metrics():
     """Get system metrics"""
-    return flask.jsonify({
+    return json_response({
         "metrics": {
             "api_requests": 1024,
             "query_count": 512,
             "active_users": 128,
             "system_load": 0.75
         }
-    }), 200
+    }, 200)
 
-# Data privacy endpoints
-@app.route('/api/query', methods=['POST'])
-@token_required
-def handle_query(current_user):
-    """Endpoint for querying archives"""
-    try:
-        data = flask.request.get_json()
-        if not data:
-            return flask.jsonify({"error": "Invalid JSON data"}), 400
-            
-        # Add user_id for auditing
-        data['user_id'] = current_user
-        
-        # Mock successful response for integration testing
-        # Simulate query_archives for testing purposes
-        response = {
-            "results": [
-                {"id": "doc1", "title": "Document 1", "timestamp": int(time.time())},
-                {"id": "doc2", "title": "Document 2", "timestamp": int(time.time())},
-            ],
-            "count": 2,
-            "query_time_ms": 42
-        }
-        return flask.jsonify(response), 200
-    except Exception as e:
-        print(f"Query error: {str(e)}")
-        return flask.jsonify({"error": str(e)}), 500
+def get_handler(name, _cache={}):
+    """
+    Resolve a function from the handlers module, importing it on first use
+    
+    handlers pulls in numpy and its own Redis client; deferring the import keeps
+    cold start cheap for workers that only ever serve probes and static files.
+    """
+    if name not in _cache:
+        import handlers
+        _cache[name] = getattr(handlers, name)
+    return _cache[name]
 
-@app.route('/api/filter', methods=['POST'])
-@token_required
-def handle_filter(current_user):
-    """Endpoint for filtering data"""
-    try:
-        data = flask.request.get_json()
+def json_endpoint(handler, stream=False):
+    """
+    Wrap a handler(data) -> (response, status) as a JSON view
+    
+    Parses the request body, injects the caller for auditing and
+    serializes the handler's result, so each route is a single table entry.
+    handler is a callable or the name of a function in handlers (resolved lazily).
+    With stream=True, successful responses carrying "results" are streamed.
+    Errors raised by the handler are turned into a 500 by handle_exception.
+    """
+    def view():
+        # silent=True turns a bad body or Content-Type into None instead of raising
+        data = flask.request.get_json(silent=True, cache=True)
         if not data:
-            return flask.jsonify({"error": "Invalid JSON data"}), 400
-            
-        # Add user_id for auditing
-        data['user_id'] = current_user
+            return raw_json_response(_ERR_INVALID_JSON, 400)
+        flask.g.payload = data
         
-        response, status = apply_filters(data)
-        return flask.jsonify(response), status
-    except Exception as e:
-        return flask.jsonify({"error": str(e)}), 500
-
-@app.route('/api/redact', methods=['POST'])
-@token_required
-def handle_redact(current_user):
-    """Endpoint for redacting names"""
-    try:
-        data = flask.request.get_json()
-        if not data:
-            return flask.jsonify({"error": "Invalid JSON data"}), 400
-            
         # Add user_id for auditing
-        data['user_id'] = current_user
+        data['user_id'] = flask.g.username
         
-        response, status = redact_names(data)
-        return flask.jsonify(response), status
-    except Exception as e:
-        return flask.jsonify({"error": str(e)}), 500
+        fn = get_handler(handler) if isinstance(handler, str) else handler
+        response, status = fn(data)
+        if stream and status == 200 and "results" in response:
+            return stream_results_response(response, status)
+        return json_response(response, status)
+    return view
 
-@app.route('/api/privacy', methods=['POST'])
-@token_required
-def handle_privacy(current_user):
-    """Endpoint for adding differential privacy"""
-    try:
-        data = flask.request.get_json()
-        if not data:
-            return flask.jsonify({"error": "Invalid JSON data"}), 400
-            
-        # Add user_id for auditing
-        data['user_id'] = current_user
-        
-        response, status = add_differential_privacy(data)
-        return flask.jsonify(response), status
-    except Exception as e:
-        return flask.jsonify({"error": str(e)}), 500
+def mock_query_archives(data):
+    """Mock successful response for integration testing (simulates query_archives)"""
+    response = {
+        "results": [
+            {"id": "doc1", "title": "Document 1", "timestamp": flask.g.now},
+            {"id": "doc2", "title": "Document 2", "timestamp": flask.g.now},
+        ],
+        "count": 2,
+        "query_time_ms": 42
+    }
+    return response, 200
 
-@app.route('/api/secure-query', methods=['POST'])
-@token_required
-def handle_secure_query(current_user):
-    """Combined endpoint for secure data querying with privacy protections"""
-    try:
-        data = flask.request.get_json()
-        if not data:
-            return flask.jsonify({"error": "Invalid JSON data"}), 400
-            
-        # Add user_id for auditing
-        data['user_id'] = current_user
-        
-        # Mock successful response for integration testing
-        # Simulate combined_query_with_privacy for testing purposes
-        response = {
-            "results": [
-                {"id": "doc1", "title": "Redacted Document 1", "value": 123.45},
-                {"id": "doc2", "title": "Redacted Document 2", "value": 678.90},
-            ],
-            "count": 2,
-            "privacy_applied": True,
-            "fields_redacted": ["pii", "sensitive"],
-            "noise_added": True,
-            "query_time_ms": 57
-        }
-        return flask.jsonify(response), 200
-    except Exception as e:
-        print(f"Secure query error: {str(e)}")
-        return flask.jsonify({"error": str(e)}), 500
+def mock_combined_query_with_privacy(data):
+    """Mock successful response for integration testing (simulates combined_query_with_privacy)"""
+    response = {
+        "results": [
+            {"id": "doc1", "title": "Redacted Document 1", "value": 123.45},
+            {"id": "doc2", "title": "Redacted Document 2", "value": 678.90},
+        ],
+        "count": 2,
+        "privacy_applied": True,
+        "fields_redacted": ["pii", "sensitive"],
+        "noise_added": True,
+        "query_time_ms": 57
+    }
+    return response, 200
+
+# Data privacy endpoints: (rule, endpoint name, handler or handlers.<name>, stream results)
+DATA_ENDPOINTS = [
+    ('/api/query', 'handle_query', mock_query_archives, True),
+    ('/api/filter', 'handle_filter', 'apply_filters', False),
+    ('/api/redact', 'handle_redact', 'redact_names', False),
+    ('/api/privacy', 'handle_privacy', 'add_differential_privacy', False),
+    ('/api/secure-query', 'handle_secure_query', mock_combined_query_with_privacy, True),
+]
+
+for rule, endpoint, handler, stream in DATA_ENDPOINTS:
+    app.add_url_rule(rule, endpoint, json_endpoint(handler, stream), methods=['POST'],
+                     provide_automatic_options=False)
 
 # Add health check endpoint for privacy services
-@app.route('/api/privacy-services/health', methods=['GET'])
+_PRIVACY_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "services": {
+        "query": "available",
+        "filter": "available",
+        "redact": "available", 
+        "privacy": "available"
+    }
+})
+
+@app.route('/api/privacy-services/health', methods=['GET'], provide_automatic_options=False)
 def privacy_health():
     """Health check for privacy services"""
-    return flask.jsonify({
-        "status": "healthy",
-        "services": {
-            "query": "available",
-            "filter": "available",
-            "redact": "available", 
-            "privacy": "available"
-        }
-    }), 200
+    return raw_json_response(_PRIVACY_HEALTH_BYTES, 200)
 
-# Add OpenAPI documentation for the API
-@app.route('/api/docs', methods=['GET'])
-def api_docs():
-    docs = {
-        "openapi": "3.0.0",
-        "info": {
-            "title": "Data Privacy API",
-            "description": "API for querying archives with privacy protections",
-            "version": "1.0.0"
-        },
-        "paths": {
-            "/api/query": {
-                "post": {
-                    "summary": "Query archives",
-                    "description": "Query data from archives based on provided parameters",
-                    "security": [{"BearerAuth": []}],
-                    "requestBody": {
-                        "required": True,
-                        "content": {
-                            "application/json": {
-                                "schema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "query_type": {"type": "string"},
-                                        "time_range": {"type": "object"},
-                                        "filters": {"type": "object"},
-                                        "limit": {"type": "integer"},
-                                        "offset": {"type": "integer"}
-                                    }
+# OpenAPI documentation for the API, serialized once at import time
+API_DOCS = {
+    "openapi": "3.0.0",
+    "info": {
+        "title": "Data Privacy API",
+        "description": "API for querying archives with privacy protections",
+        "version": "1.0.0"
+    },
+    "paths": {
+        "/api/query": {
+            "post": {
+                "summary": "Query archives",
+                "description": "Query data from archives based on provided parameters",
+                "security": [{"BearerAuth": []}],
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "query_type": {"type": "string"},
+                                    "time_range": {"type": "object"},
+                                    "filters": {"type": "object"},
+                                    "limit": {"type": "integer"},
+                                    "offset": {"type": "integer"}
                                 }
                             }
                         }
-                    },
-                    "responses": {
-                        "200": {
-                            "description": "Successful query"
-                        }
+                    }
+                },
+                "responses": {
+                    "200": {
+                        "description": "Successful query"
                     }
                 }
-            },
-            "/api/filter": {
-                "post": {
-                    "summary": "Filter data",
-                    "description": "Apply advanced filtering to data",
-                    "security": [{"BearerAuth": []}],
-                    "responses": {
-                        "200": {
-                            "description": "Successful filtering"
-                        }
+            }
+        },
+        "/api/filter": {
+            "post": {
+                "summary": "Filter data",
+                "description": "Apply advanced filtering to data",
+                "security": [{"BearerAuth": []}],
+                "responses": {
+                    "200": {
+                        "description": "Successful filtering"
                     }
                 }
-            },
-            "/api/redact": {
-                "post": {
-                    "summary": "Redact names",
-                    "description": "Redact personal names from data",
-                    "security": [{"BearerAuth": []}],
-                    "responses": {
-                        "200": {
-                            "description": "Successful redaction"
-                        }
+            }
+        },
+        "/api/redact": {
+            "post": {
+                "summary": "Redact names",
+                "description": "Redact personal names from data",
+                "security": [{"BearerAuth": []}],
+                "responses": {
+                    "200": {
+                        "description": "Successful redaction"
                     }
                 }
-            },
-            "/api/privacy": {
-                "post": {
-                    "summary": "Add differential privacy",
-                    "description": "Add differential privacy noise to data",
-                    "security": [{"BearerAuth": []}],
-                    "responses": {
-                        "200": {
-                            "description": "Successful privacy protection"
-                        }
+            }
+        },
+        "/api/privacy": {
+            "post": {
+                "summary": "Add differential privacy",
+                "description": "Add differential privacy noise to data",
+                "security": [{"BearerAuth": []}],
+                "responses": {
+                    "200": {
+                        "description": "Successful privacy protection"
                     }
                 }
-            },
-            "/api/secure-query": {
-                "post": {
-                    "summary": "Secure query with privacy protections",
-                    "description": "Combined endpoint for secure data querying with filtering, redaction, and differential privacy",
-                    "security": [{"BearerAuth": []}],
-                    "requestBody": {
-                        "required": True,
-                        "content": {
-                            "application/json": {
-                                "schema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "query_type": {"type": "string"},
-                                        "time_range": {"type": "object"},
-                                        "query_filters": {"type": "object"},
-                                        "filters": {"type": "object"},
-                                        "fields_to_redact": {"type": "array"},
-                                        "numeric_fields": {"type": "array"},
-                                        "epsilon": {"type": "number"},
-                                        "sensitivity": {"type": "number"}
-                                    }
+            }
+        },
+        "/api/secure-query": {
+            "post": {
+                "summary": "Secure query with privacy protections",
+                "description": "Combined endpoint for secure data querying with filtering, redaction, and differential privacy",
+                "security": [{"BearerAuth": []}],
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "query_type": {"type": "string"},
+                                    "time_range": {"type": "object"},
+                                    "query_filters": {"type": "object"},
+                                    "filters": {"type": "object"},
+                                    "fields_to_redact": {"type": "array"},
+                                    "numeric_fields": {"type": "array"},
+                                    "epsilon": {"type": "number"},
+                                    "sensitivity": {"type": "number"}
                                 }
                             }
                         }
-                    },
-                    "responses": {
-                        "200": {
-                            "description": "Successful secure query"
-                        }
+                    }
+                },
+                "responses": {
+                    "200": {
+                        "description": "Successful secure query"
                     }
                 }
             }
-        },
-        "components": {
-            "securitySchemes": {
-                "BearerAuth": {
-                    "type": "http",
-                    "scheme": "bearer"
-                }
+        }
+    },
+    "components": {
+        "securitySchemes": {
+            "BearerAuth": {
+                "type": "http",
+                "scheme": "bearer"
             }
         }
     }
-    return flask.jsonify(docs), 200
+}
+_API_DOCS_BYTES = orjson.dumps(API_DOCS)
+_API_DOCS_ETAG = hashlib.sha1(_API_DOCS_BYTES).hexdigest()
+
+@app.route('/api/docs', methods=['GET'], provide_automatic_options=False)
+def api_docs():
+    # Let clients and proxies cache the docs and revalidate with a 304
+    response = raw_json_response(_API_DOCS_BYTES, 200)
+    response.set_etag(_API_DOCS_ETAG)
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response.make_conditional(flask.request)
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=config.API_PORT, debug=True)
+    # The debugger and reloader wrap every request; only enable them on request
+    # FLASK_DEBUG=0/false must not enable the debugger, which is reachable on 0.0.0.0
+    debug = getattr(config, 'DEBUG', get_debug_flag())
+    app.run(host='0.0.0.0', port=config.API_PORT, debug=debug)
 
 application = app
\ No newline at end of file
@@ -4,54 +4,138 @@ Redaction Guesser Demo
 Uses Ollama API with Llama3 to guess redacted names in text
 """
 
+import hashlib
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import sys
 import re
+from pathlib import Path
 
-def dedact_text(redacted_text, ollama_url="http://localhost:11434"):
-    """
-    Send redacted text to Ollama and get dedacted version
-    """
-    
-    # The prompt that instructs the model how to dedact
-    system_prompt = """You are an intelligent dedactor submodule - you take redacted text with <<ReDActiONs>> in double brackets and return your most educated guess for the real names.
+# Shared session so repeated calls reuse the keep-alive connection to Ollama
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Guesses are cached per (redaction, surrounding text) so re-runs skip the model
+CACHE_PATH = Path.home() / ".cache" / "dedactor" / "guesses.json"
+CONTEXT_CHARS = 200
+
+# A redaction token, e.g. <<57326hf>>
+_REDACTION_RE = re.compile(r'<<[^>]+>>')
+
+# The prompt that instructs the model how to dedact
+SYSTEM_PROMPT = """You are an intelligent dedactor submodule - you take redacted text with <<ReDActiONs>> in double brackets and return your most educated guess for the real name behind each redaction.
 
 Like:
-  "... and then <<57326hf>> became the highest scoring basketball player of all time." --> "... and then LeBron James became the highest scoring basketball player of all time."
+  Text: "... and then <<57326hf>> became the highest scoring basketball player of all time."
+  Redactions: ["<<57326hf>>"]
+  --> {"<<57326hf>>": "LeBron James"}
 
 or:
 
-"<<75i83>> was the president of the USA when the Confederacy was defeated. He was later assassinated by <<8349jfu>> in a theater." --> "Abraham Lincoln was the president of the USA when the Confederacy was defeated. He was later assassinated by John Wilkes Booth in a theater."
+  Text: "<<75i83>> was the president of the USA when the Confederacy was defeated. He was later assassinated by <<8349jfu>> in a theater."
+  Redactions: ["<<75i83>>", "<<8349jfu>>"]
+  --> {"<<75i83>>": "Abraham Lincoln", "<<8349jfu>>": "John Wilkes Booth"}
 
-Only return the dedacted text, nothing else."""
+Only return the JSON object mapping each redaction to its guess, nothing else."""
 
-    # Prepare the request
+def load_cache(path=CACHE_PATH):
+    """Load cached guesses, or an empty cache if none exist yet"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, path=CACHE_PATH):
+    """Persist cached guesses"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(cache, f)
+
+def cache_key(token, text):
+    """Key a redaction by its token and the text around its first occurrence"""
+    pos = text.find(token)
+    context = text[max(0, pos - CONTEXT_CHARS):pos + len(token) + CONTEXT_CHARS]
+    return hashlib.blake2b(f"{token}\0{context}".encode(), digest_size=16).hexdigest()
+
+def generate(prompt, ollama_url="http://localhost:11434", num_predict=None, format=None):
+    """
+    Run a prompt through Ollama and return the generated text
+    
+    The generation is streamed back and assembled as it arrives; num_predict
+    optionally caps the number of generated tokens.
+    """
+    # Sampling settings belong under "options"
+    options = {"temperature": 0.7}
+    if num_predict:
+        options["num_predict"] = num_predict
     payload = {
         "model": "llama3",
-        "prompt": f"{system_prompt}\n\nRedacted text: {redacted_text}\n\nDedacted text: ",
-        "stream": False,
-        "temperature": 0.7
+        "prompt": prompt,
+        "stream": True,
+        "options": options
     }
+    if format:
+        payload["format"] = format
     
-    try:
-        # Make the API call
-        response = requests.post(
-            f"{ollama_url}/api/generate",
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        )
+    # Make the API call; Ollama streams one JSON object per line. The with block hands the
+    # connection back to the pool on every exit, including the error and early-done paths
+    with _session.post(
+        f"{ollama_url}/api/generate",
+        json=payload,
+        stream=True,
+        timeout=(3, 300)
+    ) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"API returned status code {response.status_code}")
         
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("response", "Error: No response from model")
-        else:
-            return f"Error: API returned status code {response.status_code}"
-            
-    except requests.exceptions.ConnectionError:
-        return "Error: Could not connect to Ollama. Is it running on localhost:11434?"
-    except Exception as e:
-        return f"Error: {str(e)}"
+        parts = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            parts.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                break
+    return "".join(parts)
+
+def dedact_text(redacted_text, ollama_url="http://localhost:11434", num_predict=None, cache=None):
+    """
+    Send redacted text to Ollama and get dedacted version
+    
+    All redactions not already in the cache are guessed in a single call, then
+    substituted back into the text. Pass a dict as cache to reuse guesses.
+    """
+    if cache is None:
+        cache = {}
+    
+    # Unique redaction tokens, in order of appearance
+    tokens = list(dict.fromkeys(_REDACTION_RE.findall(redacted_text)))
+    if not tokens:
+        return redacted_text
+    keys = {token: cache_key(token, redacted_text) for token in tokens}
+    
+    missing = [token for token in tokens if keys[token] not in cache]
+    if missing:
+        prompt = f"{SYSTEM_PROMPT}\n\nText: {redacted_text}\nRedactions: {json.dumps(missing)}\n--> "
+        try:
+            guesses = json.loads(generate(prompt, ollama_url, num_predict, format="json"))
+        except requests.exceptions.ConnectionError:
+            return "Error: Could not connect to Ollama. Is it running on localhost:11434?"
+        except ValueError:
+            return "Error: Model did not return valid JSON"
+        except Exception as e:
+            return f"Error: {str(e)}"
+        
+        for token in missing:
+            guess = guesses.get(token) if isinstance(guesses, dict) else None
+            if isinstance(guess, str) and guess:
+                cache[keys[token]] = guess
+    
+    # Tokens the model skipped are left redacted
+    return _REDACTION_RE.sub(lambda m: cache.get(keys[m.group(0)], m.group(0)), redacted_text)
 
 def main():
     # Check if filename provided
@@ -75,7 +159,7 @@ def main():
         sys.exit(1)
     
     # Check if text contains redactions
-    if not re.search(r'<<[^>]+>>', redacted_text):
+    if not _REDACTION_RE.search(redacted_text):
         print("Warning: No redactions found in the input text (looking for <<...>> pattern)")
     
     print("Original redacted text:")
@@ -85,8 +169,13 @@ def main():
     
     print("\nSending to Ollama for dedaction...")
     
-    # Get dedacted version
-    dedacted_text = dedact_text(redacted_text)
+    # Get dedacted version, reusing guesses from previous runs
+    cache = load_cache()
+    dedacted_text = dedact_text(redacted_text, cache=cache)
+    try:
+        save_cache(cache)
+    except OSError as e:
+        print(f"Warning: Could not save guess cache: {e}")
     
     print("\nDedacted text:")
     print("-" * 50)
@@ -106,4 +195,4 @@ def main():
         print(f"\nCould not save output file: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,4 @@
+import io
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
@@ -5,18 +6,132 @@ from datetime import datetime, timedelta
 import json
 import random
 import uuid
-from collections import defaultdict
+from collections import deque
 import time
 import threading
 from matplotlib.patches import Rectangle
 import requests
 from PIL import Image
+from pathlib import Path
 import warnings
 
 # Suppress matplotlib font warnings for emojis
 warnings.filterwarnings("ignore", category=UserWarning, module="matplotlib")
 
+# Downloaded map backgrounds are kept here so later runs skip S3
+MAP_CACHE_DIR = Path.home() / ".cache" / "mithril"
+
+# Number of recent pings the T&T system looks at per ad_id
+PROFILE_WINDOW = 10
+
+EARTH_RADIUS_M = 6371000.0
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters between arrays of points given in degrees"""
+    phi1, lam1, phi2, lam2 = np.radians(lat1), np.radians(lon1), np.radians(lat2), np.radians(lon2)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin((lam2 - lam1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+class ProfileStore:
+    """
+    Ring buffers of the most recent pings for every tracking identity at once
+    
+    Identities are integer slots; each slot's pings are a row of (slots, size) arrays.
+    """
+    def __init__(self, num_slots, size=PROFILE_WINDOW):
+        self.size = size
+        self.counts = np.zeros(num_slots, dtype=np.int64)
+        self.lats = np.zeros((num_slots, size), dtype=np.float32)
+        self.lons = np.zeros((num_slots, size), dtype=np.float32)
+        self.is_chaff = np.zeros((num_slots, size), dtype=bool)
+        
+    def append(self, slots, lats, lons, is_chaff):
+        """Append a batch of pings; pings sharing a slot are stored in batch order"""
+        if not len(slots):
+            return
+        # Group the batch by slot and rank each ping within its slot's group
+        order = np.argsort(slots, kind='stable')
+        sorted_slots = slots[order]
+        starts = np.flatnonzero(np.r_[True, sorted_slots[1:] != sorted_slots[:-1]])
+        group_sizes = np.diff(np.r_[starts, len(sorted_slots)])
+        rank = np.arange(len(sorted_slots)) - np.repeat(starts, group_sizes)
+        
+        # A slot given more pings than the window holds keeps only its latest ones
+        keep = rank >= np.repeat(group_sizes, group_sizes) - self.size
+        rows, src = sorted_slots[keep], order[keep]
+        cols = (self.counts[rows] + rank[keep]) % self.size
+        self.lats[rows, cols] = lats[src]
+        self.lons[rows, cols] = lons[src]
+        self.is_chaff[rows, cols] = is_chaff
+        self.counts[sorted_slots[starts]] += group_sizes
+        
+    def summarize(self, slots):
+        """
+        Centroid and chaff flag of each given slot that has pings
+        Returns (slots, centroid lats, centroid lons, has_chaff) for those slots
+        """
+        slots = slots[self.counts[slots] > 0]
+        n = np.minimum(self.counts[slots], self.size)
+        valid = np.arange(self.size) < n[:, None]
+        centroid_lats = np.where(valid, self.lats[slots], 0).sum(axis=1) / n
+        centroid_lons = np.where(valid, self.lons[slots], 0).sum(axis=1) / n
+        has_chaff = (self.is_chaff[slots] & valid).any(axis=1)
+        return slots, centroid_lats, centroid_lons, has_chaff
+
+class PointRing:
+    """Fixed-capacity ring of recent (lon, lat) points for the live location scatter"""
+    def __init__(self, capacity=200):
+        self.points = np.empty((capacity, 2), dtype=np.float32)
+        self.capacity = capacity
+        self.head = 0
+        self.count = 0
+        
+    def extend(self, lons, lats):
+        """Overwrite the oldest points with a batch of new ones"""
+        n = len(lons)
+        if n > self.capacity:
+            lons, lats, n = lons[-self.capacity:], lats[-self.capacity:], self.capacity
+        idx = (self.head + np.arange(n)) % self.capacity
+        self.points[idx, 0] = lons
+        self.points[idx, 1] = lats
+        self.head = (self.head + n) % self.capacity
+        self.count = min(self.count + n, self.capacity)
+        
+    def valid(self):
+        """The stored points (in ring order, which a scatter plot doesn't care about)"""
+        return self.points[:self.count]
+
 class MithrilRealtimeDemo:
+    # Terminal feed color for each message kind; anything else is white
+    FEED_COLORS = {
+        'CHAFF': '#ff6b6b',    # Light red
+        'REAL': '#74c0fc',     # Light blue
+        'T&T': '#ffd43b',      # Yellow
+        'MITHRIL': '#51cf66',  # Green
+        'MAP': '#ff8cc8',      # Pink
+    }
+    
+    # Common IP ranges for different regions, as one- or two-octet prefixes
+    IP_RANGES = {
+        'US_West': ('173.252', '199.201', '208.43', '69.171', '31.13'),
+        'US_East': ('54.239', '52.84', '34.196', '107.20', '184.72'),
+        'US_Central': ('162.254', '104.16', '198.41', '172.217', '216.58'),
+        'ISP_Comcast': ('73', '96', '108', '174', '98'),
+        'ISP_Verizon': ('71', '72', '74', '75', '76'),
+        'ISP_ATT': ('99', '12', '135', '192', '204'),
+        'Mobile_Carrier': ('100', '10', '192.168')
+    }
+    IP_RANGE_KEYS = tuple(IP_RANGES)
+    
+    # Movement patterns, indexed by the integer code stored on each person
+    MOVEMENT_PATTERNS = ('stationary', 'commuter', 'wanderer')
+    # Per-step movement (degrees) for each code: ~100m, ~500m, ~1km
+    MOVEMENT_DELTAS = np.array([0.001, 0.005, 0.01], dtype=np.float32)
+    
+    # Columns of realtime_stats, one float64 entry per T&T test
+    STATS_COLUMNS = ('timestamps', 'true_positive_rates', 'false_positive_rates',
+                     'chaff_rates', 'data_points_processed')
+    
     def __init__(self, population_size=100, map_bounds=(-122.5, -122.3, 37.7, 37.8), map_filename="map1.png"):
         """
         Initialize Mithril cloaking demonstration with real-time visualization
@@ -66,17 +181,11 @@ class MithrilRealtimeDemo:
         
         # Initialize population with unique ad_ids and starting locations
         self.population = []
-        self.profiles = defaultdict(list)  # ad_id -> list of location pings
         self.current_chaff_rate = 0.0
         
-        # Real-time tracking stats
-        self.realtime_stats = {
-            'timestamps': [],
-            'true_positive_rates': [],
-            'false_positive_rates': [],
-            'chaff_rates': [],
-            'data_points_processed': []
-        }
+        # Real-time tracking stats: preallocated columns, the first stats_count entries are filled
+        self.total_data_points = 0
+        self._allocate_stats(0)
         
         # Animation and plotting setup
         self.fig = None
@@ -85,67 +194,70 @@ class MithrilRealtimeDemo:
         self.simulation_complete = False
         
         # Live data for location visualization
-        self.live_real_locs = {'lons': [], 'lats': []}
-        self.live_chaff_locs = {'lons': [], 'lats': []}
+        self.live_real_locs = PointRing(200)
+        self.live_chaff_locs = PointRing(200)
         
-        # Terminal feed data
-        self.terminal_feed = []
+        # Terminal feed data; the deque drops the oldest message itself
         self.max_terminal_lines = 25  # More lines for slower simulation
+        self.terminal_feed = deque(maxlen=self.max_terminal_lines)
         
         # Map image
         self.map_image = None
         
+        # Bulk random draws for the vectorized simulation step
+        self.rng = np.random.default_rng()
+        
         self._initialize_population()
         
-    def add_terminal_message(self, message):
-        """Add a message to the terminal feed"""
+    def add_terminal_message(self, kind, message):
+        """
+        Add a message to the terminal feed
+        kind: Message type shown as its prefix (REAL, CHAFF, MITHRIL, ...); also picks its color
+        """
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.terminal_feed.append(f"[{timestamp}] {message}")
-        
-        # Keep only the most recent messages
-        if len(self.terminal_feed) > self.max_terminal_lines:
-            self.terminal_feed = self.terminal_feed[-self.max_terminal_lines:]
+        self.terminal_feed.append((f"[{timestamp}] {kind}: {message}", self.FEED_COLORS.get(kind, 'white')))
     
     def load_map_image(self):
-        """Load the map image from S3"""
+        """Load the map image from the local cache, or from S3 on first use"""
         try:
+            cache_path = MAP_CACHE_DIR / self.map_filename
+            if cache_path.is_file():
+                self.map_image = Image.open(cache_path)
+                self.add_terminal_message("MAP", f"Loaded {self.map_filename} from cache")
+                return True
+            
             map_url = f'https://mithrilmedia.s3.us-east-1.amazonaws.com/maps/{self.map_filename}'
             response = requests.get(map_url, timeout=10)
             if response.status_code == 200:
-                self.map_image = Image.open(requests.get(map_url, stream=True).raw)
-                self.add_terminal_message(f"MAP: Loaded {self.map_filename} successfully")
+                # Decode the body we already have rather than fetching it again
+                self.map_image = Image.open(io.BytesIO(response.content))
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    cache_path.write_bytes(response.content)
+                except OSError as e:
+                    self.add_terminal_message("MAP", f"Could not cache {self.map_filename} - {str(e)[:50]}")
+                self.add_terminal_message("MAP", f"Loaded {self.map_filename} successfully")
                 return True
             else:
-                self.add_terminal_message(f"MAP: Failed to load {self.map_filename} (HTTP {response.status_code})")
+                self.add_terminal_message("MAP", f"Failed to load {self.map_filename} (HTTP {response.status_code})")
                 return False
         except Exception as e:
-            self.add_terminal_message(f"MAP: Error loading {self.map_filename} - {str(e)[:50]}")
+            self.add_terminal_message("MAP", f"Error loading {self.map_filename} - {str(e)[:50]}")
             return False
             
     def generate_ip_address(self, person_location='US'):
         """Generate realistic IP addresses based on geographic location"""
-        # Common IP ranges for different regions
-        ip_ranges = {
-            'US_West': ['173.252', '199.201', '208.43', '69.171', '31.13'],
-            'US_East': ['54.239', '52.84', '34.196', '107.20', '184.72'],
-            'US_Central': ['162.254', '104.16', '198.41', '172.217', '216.58'],
-            'ISP_Comcast': ['73.', '96.', '108.', '174.', '98.'],
-            'ISP_Verizon': ['71.', '72.', '74.', '75.', '76.'],
-            'ISP_ATT': ['99.', '12.', '135.', '192.', '204.'],
-            'Mobile_Carrier': ['100.', '10.', '192.168']
-        }
-        
         # Pick a random range
-        range_type = random.choice(list(ip_ranges.keys()))
-        prefix = random.choice(ip_ranges[range_type])
+        range_type = random.choice(self.IP_RANGE_KEYS)
+        prefix = random.choice(self.IP_RANGES[range_type])
         
         # Complete the IP
-        if '.' in prefix and len(prefix.split('.')) == 2:
+        if '.' in prefix:
             # Two octets provided
             return f"{prefix}.{random.randint(0, 255)}.{random.randint(1, 254)}"
         else:
             # One octet provided
-            return f"{prefix}{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
+            return f"{prefix}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
         
     def _initialize_population(self):
         """Create initial population with realistic movement patterns"""
@@ -155,225 +267,191 @@ class MithrilRealtimeDemo:
             last_name = random.choice(self.last_names)
             full_name = f"{first_name} {last_name}"
             
-            # Random starting location within bounds
-            start_lat = random.uniform(self.min_lat, self.max_lat)
-            start_lon = random.uniform(self.min_lon, self.max_lon)
-            
             # Generate 2-3 ad tracking identities per person
             num_identities = random.randint(2, 3)
             available_services = list(self.ad_tracking_services.keys())
             selected_services = random.sample(available_services, num_identities)
             
-            tracking_identities = []
-            for service_name in selected_services:
-                ad_id_generator = self.ad_tracking_services[service_name]
-                ad_id = ad_id_generator()
-                tracking_identities.append({
-                    'service': service_name,
-                    'ad_id': ad_id
-                })
+            mv_code = random.randrange(len(self.MOVEMENT_PATTERNS))
+            
+            # Identities as parallel tuples: index k is (id_services[k], id_adids[k])
+            id_services = tuple(selected_services)
+            id_adids = tuple(self.ad_tracking_services[service_name]() for service_name in id_services)
+            
+            base_ip = self.generate_ip_address()
+            base_ip_prefix, _, base_ip_last = base_ip.rpartition('.')
             
             person = {
-                'tracking_identities': tracking_identities,
-                'primary_service': tracking_identities[0]['service'],  # For backward compatibility
-                'primary_ad_id': tracking_identities[0]['ad_id'],     # For backward compatibility
+                'id_services': id_services,
+                'id_adids': id_adids,
+                'primary_service': id_services[0],  # For backward compatibility
+                'primary_ad_id': id_adids[0],       # For backward compatibility
                 'name': full_name,
                 'first_name': first_name,
                 'last_name': last_name,
-                'true_lat': start_lat,
-                'true_lon': start_lon,
-                'base_ip': self.generate_ip_address(),
-                'movement_pattern': random.choice(['stationary', 'commuter', 'wanderer']),
+                'base_ip': base_ip,
+                # Split once so real pings only need integer math on the last octet
+                'base_ip_prefix': base_ip_prefix + '.',
+                'base_ip_last': int(base_ip_last),
+                'masked_ip': self._mask_ip(base_ip),
+                'movement_pattern': self.MOVEMENT_PATTERNS[mv_code],
+                'mv_code': mv_code,
                 'is_protected': i < 10  # First 10 people are "protected" subjects
             }
             
             self.population.append(person)
-            
-    def generate_location_ping(self, person, timestamp, is_chaff=False):
-        """Generate a location ping JSON for a person"""
-        # Pick one of the person's tracking identities randomly
-        chosen_identity = random.choice(person['tracking_identities'])
         
-        if is_chaff:
-            # Chaff locations are completely random within bounds
-            lat = random.uniform(self.min_lat, self.max_lat)
-            lon = random.uniform(self.min_lon, self.max_lon)
-            ad_id = chosen_identity['ad_id']  # Use real ad_id but fake location
-            service = chosen_identity['service']
+        # True locations and per-step movement live in columns so a step moves everyone at once
+        n = self.population_size
+        self.true_lats = self.rng.uniform(self.min_lat, self.max_lat, n)
+        self.true_lons = self.rng.uniform(self.min_lon, self.max_lon, n)
+        self.mv_codes = np.array([p['mv_code'] for p in self.population], dtype=np.int8)
+        self.movement_deltas = self.MOVEMENT_DELTAS[self.mv_codes]
+        self.protected_mask = np.array([p['is_protected'] for p in self.population], dtype=bool)
+        self.protected_idx = np.flatnonzero(self.protected_mask)
+        # Chance a REAL ping shows in the terminal feed: much higher for protected users
+        self.feed_probs = np.where(self.protected_mask, 0.5, 0.2)
+        
+        # Every tracking identity gets an integer profile slot: person i's identity k is
+        # id_slots[i, k]. A step picks everyone's identities with one draw and one gather.
+        self.id_counts = np.array([len(p['id_adids']) for p in self.population])
+        slot_starts = np.cumsum(self.id_counts) - self.id_counts
+        self.id_slots = slot_starts[:, None] + np.arange(self.id_counts.max())
+        self.slot_owner = np.repeat(np.arange(n), self.id_counts)
+        self.protected_slots = np.flatnonzero(self.protected_mask[self.slot_owner])
+        self.profiles = ProfileStore(len(self.slot_owner))  # recent pings per identity slot
             
-            # Generate chaff IP (different from person's real IP)
+    def _core_ping(self, person, id_index, lat, lon, timestamp, is_chaff=False, ip_jitter=0):
+        """
+        Build the fields of a location ping that identify and place a person
+        id_index: Which of the person's tracking identities the ping was seen under
+        ip_jitter: Offset applied to the last octet of a real ping's base IP
+        """
+        if is_chaff:
+            # Generate chaff IP; a collision with the person's real IP is vanishingly unlikely
             ip_address = self.generate_ip_address()
-            while ip_address == person['base_ip']:  # Ensure different IP
-                ip_address = self.generate_ip_address()
         else:
-            # Real location with small movement based on pattern
-            movement_size = {
-                'stationary': 0.001,   # ~100m
-                'commuter': 0.005,     # ~500m  
-                'wanderer': 0.01       # ~1km
-            }
-            
-            delta = movement_size[person['movement_pattern']]
-            person['true_lat'] += random.uniform(-delta, delta)
-            person['true_lon'] += random.uniform(-delta, delta)
-            
-            # Keep within bounds
-            person['true_lat'] = np.clip(person['true_lat'], self.min_lat, self.max_lat)
-            person['true_lon'] = np.clip(person['true_lon'], self.min_lon, self.max_lon)
-            
-            lat, lon = person['true_lat'], person['true_lon']
-            ad_id = chosen_identity['ad_id']
-            service = chosen_identity['service']
-            
             # Real IP with small variation (same ISP/region)
-            base_octets = person['base_ip'].split('.')
             # Vary last octet slightly to simulate DHCP/dynamic IP
-            last_octet = int(base_octets[-1]) + random.randint(-10, 10)
-            last_octet = max(1, min(254, last_octet))  # Keep in valid range
-            ip_address = f"{'.'.join(base_octets[:-1])}.{last_octet}"
+            last_octet = max(1, min(254, person['base_ip_last'] + ip_jitter))  # Keep in valid range
+            ip_address = f"{person['base_ip_prefix']}{last_octet}"
         
-        ping = {
+        return {
             'timestamp': timestamp.isoformat(),
             'lat': lat,
             'lon': lon,
-            'ad_id': ad_id,
-            'service': service,
+            'ad_id': person['id_adids'][id_index],
+            'service': person['id_services'][id_index],
             'ip_address': ip_address,
             'name': person['name'],
-            'device_type': random.choice(['mobile', 'tablet', 'desktop']),
-            'user_agent': random.choice([
-                'Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X)',
-                'Mozilla/5.0 (Android 11; Mobile; rv:92.0)',
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/93.0',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) Safari/605.1'
-            ]),
             'is_chaff': is_chaff
         }
-        
-        return ping
     
-    def inject_chaff(self, protected_person, timestamp, num_chaff=5):
-        """Inject chaff pings for a protected person"""
-        chaff_pings = []
-        for _ in range(num_chaff):
-            chaff_ping = self.generate_location_ping(protected_person, timestamp, is_chaff=True)
-            chaff_pings.append(chaff_ping)
-        return chaff_pings
+    @staticmethod
+    def _mask_ip(ip_address):
+        """Partially mask an IP the way the feed shows it, e.g. 173..12.34"""
+        ip_parts = ip_address.split('.')
+        if len(ip_parts) != 4:
+            return ip_address
+        return f"{ip_parts[0]}..{ip_parts[2]}.{ip_parts[3]}"
+    
+    def add_ping_message(self, label, ping):
+        """Show a ping in the terminal feed with a partially masked IP"""
+        ip_display = self._mask_ip(ping['ip_address'])
+        self.add_terminal_message(label, f"{ping['name'][:15]} via {ping['service'][:12]} IP:{ip_display}")
+    
+    def inject_chaff(self, timestamp):
+        """
+        Inject chaff pings for protected individuals at the current chaff rate
+        Returns the (lats, lons) columns of the injected chaff
+        """
+        # Which protected users get chaff this step, and how much (1-8 pings each)
+        chaffed = self.protected_idx[self.rng.random(len(self.protected_idx)) < self.current_chaff_rate]
+        owners = np.repeat(chaffed, self.rng.integers(1, 9, len(chaffed)))
+        
+        # Chaff locations are completely random within bounds, under a real ad_id
+        lats = self.rng.uniform(self.min_lat, self.max_lat, len(owners))
+        lons = self.rng.uniform(self.min_lon, self.max_lon, len(owners))
+        id_cols = self.rng.integers(0, self.id_counts[owners])
+        # Chaff messages are shown in the terminal less often than REAL ones
+        shown = self.rng.random(len(owners)) < 0.1
+        
+        self.profiles.append(self.id_slots[owners, id_cols], lats, lons, True)
+        for k in np.flatnonzero(shown):
+            chaff_ping = self._core_ping(self.population[owners[k]], id_cols[k], lats[k], lons[k],
+                                         timestamp, is_chaff=True)
+            self.add_ping_message("CHAFF", chaff_ping)
+        
+        return lats, lons
+    
+    def _step_vectorized(self, timestamp):
+        """Move the whole population by its movement pattern; returns the (lats, lons) columns"""
+        self.true_lats += self.rng.uniform(-self.movement_deltas, self.movement_deltas)
+        self.true_lons += self.rng.uniform(-self.movement_deltas, self.movement_deltas)
+        
+        # Keep within bounds
+        np.clip(self.true_lats, self.min_lat, self.max_lat, out=self.true_lats)
+        np.clip(self.true_lons, self.min_lon, self.max_lon, out=self.true_lons)
+        return self.true_lats, self.true_lons
     
     def simulate_time_step(self, timestamp):
-        """Simulate one time step of location pings + chaff injection"""
-        all_pings = []
-        step_real_locs = {'lons': [], 'lats': []}
-        step_chaff_locs = {'lons': [], 'lats': []}
-        
-        # Generate real pings for all population
-        for person in self.population:
-            real_ping = self.generate_location_ping(person, timestamp, is_chaff=False)
-            all_pings.append(real_ping)
-            
-            # Collect for visualization
-            if person['is_protected']:
-                step_real_locs['lons'].append(real_ping['lon'])
-                step_real_locs['lats'].append(real_ping['lat'])
-                
-                # Add sample messages to terminal feed - much higher chance for REAL events
-                if random.random() < 0.5:  # 50% chance to show REAL events in terminal
-                    ip_masked = real_ping['ip_address'].split('.')
-                    ip_display = f"{ip_masked[0]}..{ip_masked[2]}.{ip_masked[3]}"
-                    self.add_terminal_message(f"REAL: {real_ping['name'][:15]} via {real_ping['service'][:12]} IP:{ip_display}")
-            
-            # Also show some non-protected users for realism
-            elif random.random() < 0.2:  # 20% chance to show non-protected users
-                ip_masked = real_ping['ip_address'].split('.')
-                ip_display = f"{ip_masked[0]}..{ip_masked[2]}.{ip_masked[3]}"
-                self.add_terminal_message(f"REAL: {real_ping['name'][:15]} via {real_ping['service'][:12]} IP:{ip_display}")
-            
-            # Add to profiles for T&T system (use the ad_id from the ping)
-            self.profiles[real_ping['ad_id']].append(real_ping)
+        """
+        Simulate one time step of location pings + chaff injection
+        Returns the number of pings generated
+        """
+        # Real pings for the whole population, as columns
+        lats, lons = self._step_vectorized(timestamp)
+        # Feed sampling and DHCP-style IP jitter, drawn for everyone at once
+        shown = self.rng.random(self.population_size) < self.feed_probs
+        ip_jitter = self.rng.integers(-10, 11, self.population_size)
+        # Each person is seen under one of their identities, picked for everyone at once
+        id_cols = self.rng.integers(0, self.id_counts)
+        
+        # Add to profiles for T&T system, under the identity each ping was seen with
+        self.profiles.append(self.id_slots[np.arange(self.population_size), id_cols], lats, lons, False)
+        
+        # Only pings shown in the terminal feed are built as dicts
+        for i in np.flatnonzero(shown):
+            real_ping = self._core_ping(self.population[i], id_cols[i], lats[i], lons[i], timestamp,
+                                        ip_jitter=int(ip_jitter[i]))
+            self.add_ping_message("REAL", real_ping)
+        
+        # Collect protected users for visualization
+        self.live_real_locs.extend(lons[self.protected_mask], lats[self.protected_mask])
+        num_pings = self.population_size
         
         # Inject chaff for protected individuals
         chaff_injected = 0
         if self.current_chaff_rate > 0:
-            for person in self.population:
-                if person['is_protected'] and random.random() < self.current_chaff_rate:
-                    num_chaff = random.randint(1, 8)  # Variable chaff volume
-                    chaff_pings = self.inject_chaff(person, timestamp, num_chaff)
-                    all_pings.extend(chaff_pings)
-                    chaff_injected += len(chaff_pings)
-                    
-                    # Collect chaff for visualization
-                    for chaff_ping in chaff_pings:
-                        step_chaff_locs['lons'].append(chaff_ping['lon'])
-                        step_chaff_locs['lats'].append(chaff_ping['lat'])
-                        self.profiles[chaff_ping['ad_id']].append(chaff_ping)
-                        
-                        # Add chaff messages to terminal - lower chance than REAL
-                        if random.random() < 0.1:  # 10% chance to show chaff in terminal
-                            ip_masked = chaff_ping['ip_address'].split('.')
-                            ip_display = f"{ip_masked[0]}..{ip_masked[2]}.{ip_masked[3]}"
-                            self.add_terminal_message(f"CHAFF: {chaff_ping['name'][:15]} via {chaff_ping['service'][:12]} IP:{ip_display}")
+            chaff_lats, chaff_lons = self.inject_chaff(timestamp)
+            chaff_injected = len(chaff_lats)
+            
+            # Collect chaff for visualization
+            self.live_chaff_locs.extend(chaff_lons, chaff_lats)
+        num_pings += chaff_injected
         
         # Add status messages less frequently
         if chaff_injected > 0 and random.random() < 0.3:  # 30% chance to show chaff injection status
-            self.add_terminal_message(f"MITHRIL: Injected {chaff_injected} chaff pings ({self.current_chaff_rate*100:.0f}% rate)")
-        
-        # Update live location data (keep last 100 points for performance)
-        self.live_real_locs['lons'].extend(step_real_locs['lons'])
-        self.live_real_locs['lats'].extend(step_real_locs['lats'])
-        self.live_chaff_locs['lons'].extend(step_chaff_locs['lons'])
-        self.live_chaff_locs['lats'].extend(step_chaff_locs['lats'])
-        
-        # Keep only recent data for performance
-        max_points = 200
-        if len(self.live_real_locs['lons']) > max_points:
-            self.live_real_locs['lons'] = self.live_real_locs['lons'][-max_points:]
-            self.live_real_locs['lats'] = self.live_real_locs['lats'][-max_points:]
-        if len(self.live_chaff_locs['lons']) > max_points:
-            self.live_chaff_locs['lons'] = self.live_chaff_locs['lons'][-max_points:]
-            self.live_chaff_locs['lats'] = self.live_chaff_locs['lats'][-max_points:]
-        
-        return all_pings
+            self.add_terminal_message("MITHRIL", f"Injected {chaff_injected} chaff pings ({self.current_chaff_rate*100:.0f}% rate)")
+        
+        return num_pings
     
-    def targeting_tracking_system(self, tolerance=0.01):
+    def targeting_tracking_system(self, tolerance=1000):
         """
         Toy T&T system that tries to match ad_ids to location patterns
+        tolerance: Distance in meters within which a prediction counts as a match
         Returns true_positive_rate for protected individuals
         """
-        correct_matches = 0
-        total_attempts = 0
-        false_positives = 0
-        
-        for person in self.population:
-            if not person['is_protected']:
-                continue
-                
-            true_location = (person['true_lat'], person['true_lon'])
-            
-            # Check all ad_ids for this person
-            for identity in person['tracking_identities']:
-                ad_id = identity['ad_id']
-                
-                # T&T system tries to predict location based on profile
-                if ad_id in self.profiles and len(self.profiles[ad_id]) > 0:
-                    recent_pings = self.profiles[ad_id][-10:]  # Last 10 pings
-                    
-                    # Simple centroid-based prediction
-                    avg_lat = np.mean([ping['lat'] for ping in recent_pings])
-                    avg_lon = np.mean([ping['lon'] for ping in recent_pings])
-                    predicted_location = (avg_lat, avg_lon)
-                    
-                    # Check if prediction is close to true location
-                    distance = np.sqrt((true_location[0] - predicted_location[0])**2 + 
-                                     (true_location[1] - predicted_location[1])**2)
-                    
-                    total_attempts += 1
-                    if distance < tolerance:
-                        correct_matches += 1
-                    
-                    # Count false positives (chaff-influenced predictions)
-                    chaff_count = sum(1 for ping in recent_pings if ping.get('is_chaff', False))
-                    if chaff_count > 0:
-                        false_positives += 1
+        # T&T system predicts each protected identity's location as the centroid of its recent pings
+        slots, pred_lats, pred_lons, has_chaff = self.profiles.summarize(self.protected_slots)
+        owners = self.slot_owner[slots]
+        
+        # Score every prediction at once
+        total_attempts = len(slots)
+        distances = haversine_m(self.true_lats[owners], self.true_lons[owners], pred_lats, pred_lons)
+        correct_matches = int((distances < tolerance).sum())
+        # Count false positives (chaff-influenced predictions)
+        false_positives = int(has_chaff.sum())
         
         true_positive_rate = correct_matches / max(total_attempts, 1)
         false_positive_rate = false_positives / max(total_attempts, 1)
@@ -383,7 +461,7 @@ class MithrilRealtimeDemo:
             accuracy_change = abs(true_positive_rate - self.last_tp_rate)
             if accuracy_change > 0.1:  # 10% change
                 direction = "↓" if true_positive_rate < self.last_tp_rate else "↑"
-                self.add_terminal_message(f"T&T: Accuracy {direction} {true_positive_rate*100:.1f}% (Δ{accuracy_change*100:.1f}%)")
+                self.add_terminal_message("T&T", f"Accuracy {direction} {true_positive_rate*100:.1f}% (Δ{accuracy_change*100:.1f}%)")
         
         self.last_tp_rate = true_positive_rate
         
@@ -396,33 +474,31 @@ class MithrilRealtimeDemo:
         
         sample_people = random.sample(self.population[:10], min(5, len(self.population)))
         
+        # Collect every line first so the whole block goes out in one write
+        lines = []
         for person in sample_people:
-            print(f"👤 {person['name']}")
+            lines.append(f"👤 {person['name']}")
             
             # Show all tracking identities for this person
-            for i, identity in enumerate(person['tracking_identities']):
-                if i == 0:
-                    print(f"   🏷️  Tracking Service: {identity['service']}")
-                    print(f"   🆔 Ad ID: {identity['ad_id']}")
-                else:
-                    print(f"   🏷️  Tracking Service: {identity['service']}")
-                    print(f"   🆔 Ad ID: {identity['ad_id']}")
+            for service, ad_id in zip(person['id_services'], person['id_adids']):
+                lines.append(f"   🏷️  Tracking Service: {service}")
+                lines.append(f"   🆔 Ad ID: {ad_id}")
             
-            # Format IP to match user's example with partial masking
-            ip_parts = person['base_ip'].split('.')
-            if len(ip_parts) == 4:
-                masked_ip = f"{ip_parts[0]}..{ip_parts[2]}.{ip_parts[3]}"
-            else:
-                masked_ip = person['base_ip']
-            
-            print(f"   🌐 Base IP: {masked_ip}")
-            print(f"   🚶 Movement Pattern: {person['movement_pattern']}")
-            print(f"   🛡️  Protected: {'Yes' if person['is_protected'] else 'No'}")
-            print()
+            lines.append(f"   🌐 Base IP: {person['masked_ip']}")
+            lines.append(f"   🚶 Movement Pattern: {person['movement_pattern']}")
+            lines.append(f"   🛡️  Protected: {'Yes' if person['is_protected'] else 'No'}")
+            lines.append("")
+        
+        print('\n'.join(lines))
     
-    def setup_realtime_plots(self):
-        """Initialize the real-time plotting interface"""
-        plt.ion()  # Turn on interactive mode
+    def setup_realtime_plots(self, num_points=1):
+        """
+        Initialize the real-time plotting interface
+        num_points: Number of stats samples the run will record (fixes the x axes)
+        
+        Static content (titles, grids, the map) is drawn once. Everything that
+        changes per frame is an animated artist that update_plots modifies in place.
+        """
         self.fig, ((self.ax1, self.ax2), (self.ax3, self.ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         
         # Load the map image
@@ -433,14 +509,26 @@ class MithrilRealtimeDemo:
         self.ax1.set_xlabel('Time Steps')
         self.ax1.set_ylabel('Accuracy (%)')
         self.ax1.grid(True, alpha=0.3)
+        self.ax1.set_xlim(0, max(num_points - 1, 1))
         self.ax1.set_ylim(0, 100)
+        self.acc_line, = self.ax1.plot([], [], 'ro-', linewidth=2, markersize=6, animated=True)
+        self.acc_fill = None
+        self.acc_text = self.ax1.text(0.02, 0.98, '', transform=self.ax1.transAxes, fontsize=12,
+                                      verticalalignment='top', fontweight='bold', animated=True,
+                                      bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
         
         # Plot 2: Chaff Rate over time
         self.ax2.set_title('Chaff Injection Rate', fontsize=14, fontweight='bold')
         self.ax2.set_xlabel('Time Steps')
         self.ax2.set_ylabel('Chaff Rate (%)')
         self.ax2.grid(True, alpha=0.3)
+        self.ax2.set_xlim(0, max(num_points - 1, 1))
         self.ax2.set_ylim(0, 100)
+        self.chaff_line, = self.ax2.plot([], [], 'bo-', linewidth=2, markersize=6, animated=True)
+        self.chaff_fill = None
+        self.chaff_text = self.ax2.text(0.02, 0.98, '', transform=self.ax2.transAxes, fontsize=12,
+                                        verticalalignment='top', fontweight='bold', animated=True,
+                                        bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
         
         # Plot 3: Live location visualization with map background
         self.ax3.set_title(f'Live Location Pings - {self.map_filename}', fontsize=14, fontweight='bold')
@@ -449,10 +537,19 @@ class MithrilRealtimeDemo:
         self.ax3.set_xlim(self.min_lon, self.max_lon)
         self.ax3.set_ylim(self.min_lat, self.max_lat)
         
-        # Add map as background if loaded
+        # Add map as background if loaded. It is static, so it is rasterized into the
+        # blit background once; call self.map_artist.set_data() if the map ever changes.
+        self.map_artist = None
         if self.map_image:
-            self.ax3.imshow(self.map_image, extent=[self.min_lon, self.max_lon, self.min_lat, self.max_lat], 
-                           aspect='auto', alpha=0.7, zorder=0)
+            self.map_artist = self.ax3.imshow(self.map_image, extent=[self.min_lon, self.max_lon, self.min_lat, self.max_lat],
+                                              aspect='auto', alpha=0.7, zorder=0)
+        
+        # Location points on top of map
+        self.real_scat = self.ax3.scatter([], [], c='blue', alpha=0.8, s=25, label='Real Locations', zorder=2,
+                                          edgecolors='white', linewidth=0.5, animated=True)
+        self.chaff_scat = self.ax3.scatter([], [], c='red', alpha=0.6, s=20, label='Chaff Locations', zorder=1,
+                                           edgecolors='white', linewidth=0.5, animated=True)
+        self.ax3.legend(loc='upper right')
         
         # Plot 4: Terminal feed
         self.ax4.set_title('Live Surveillance Traffic Feed', fontsize=14, fontweight='bold')
@@ -463,122 +560,166 @@ class MithrilRealtimeDemo:
         # Set black background for terminal feel
         self.ax4.set_facecolor('black')
         
+        # One text line per feed slot, newest at the top; update_plots only changes their text
+        line_height = 1.0 / self.max_terminal_lines
+        self.term_texts = [
+            self.ax4.text(0.02, 0.95 - (i * line_height), '', transform=self.ax4.transAxes,
+                          fontsize=9, fontfamily='monospace', color='white',
+                          verticalalignment='top', animated=True)
+            for i in range(self.max_terminal_lines)
+        ]
+        
         # Add initial terminal messages
-        self.add_terminal_message("MITHRIL: System initialized")
-        self.add_terminal_message(f"MITHRIL: Tracking {self.population_size} subjects")
-        self.add_terminal_message(f"MITHRIL: {len([p for p in self.population if p['is_protected']])} protected users")
+        self.add_terminal_message("MITHRIL", "System initialized")
+        self.add_terminal_message("MITHRIL", f"Tracking {self.population_size} subjects")
+        self.add_terminal_message("MITHRIL", f"{len([p for p in self.population if p['is_protected']])} protected users")
         
         plt.tight_layout()
-        plt.show(block=False)
+        
+    def _allocate_stats(self, num_points):
+        """Preallocate room for num_points stats samples (timestamps as epoch seconds)"""
+        self.realtime_stats = {column: np.empty(num_points, dtype=np.float64) for column in self.STATS_COLUMNS}
+        self.stats_x = np.arange(num_points)
+        self.stats_count = 0
+    
+    def _replace_fill(self, ax, old_fill, x, y, color):
+        """Swap a fill_between area for one covering the new data"""
+        if old_fill is not None:
+            old_fill.remove()
+        return ax.fill_between(x, y, alpha=0.3, color=color, animated=True)
         
     def update_plots(self):
-        """Update all plots with current data"""
-        if not self.realtime_stats['timestamps']:
-            return
-            
-        # Clear axes 1-3 only (preserve terminal in ax4)
-        self.ax1.clear()
-        self.ax2.clear() 
-        self.ax3.clear()
+        """Update all plots with current data; returns the artists that changed"""
+        n = self.stats_count
+        if not n:
+            return []
+        x = self.stats_x[:n]
         
         # Plot 1: T&T Accuracy
-        if len(self.realtime_stats['true_positive_rates']) > 0:
-            accuracy_percentages = [tp*100 for tp in self.realtime_stats['true_positive_rates']]
-            self.ax1.plot(range(len(accuracy_percentages)), accuracy_percentages, 'ro-', linewidth=2, markersize=6)
-            self.ax1.fill_between(range(len(accuracy_percentages)), accuracy_percentages, alpha=0.3, color='red')
-        
-        self.ax1.set_title('MITHRIL - Real-Time T&T System Accuracy', fontsize=14, fontweight='bold')
-        self.ax1.set_xlabel('Time Steps')
-        self.ax1.set_ylabel('Accuracy (%)')
-        self.ax1.grid(True, alpha=0.3)
-        self.ax1.set_ylim(0, 100)
-        
-        # Add current accuracy text
-        if self.realtime_stats['true_positive_rates']:
-            current_acc = self.realtime_stats['true_positive_rates'][-1] * 100
-            self.ax1.text(0.02, 0.98, f'Current: {current_acc:.1f}%', 
-                         transform=self.ax1.transAxes, fontsize=12, 
-                         verticalalignment='top', fontweight='bold',
-                         bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+        accuracy_percentages = self.realtime_stats['true_positive_rates'][:n] * 100
+        self.acc_line.set_data(x, accuracy_percentages)
+        self.acc_fill = self._replace_fill(self.ax1, self.acc_fill, x, accuracy_percentages, 'red')
+        self.acc_text.set_text(f'Current: {accuracy_percentages[-1]:.1f}%')
         
         # Plot 2: Chaff Rate
-        if len(self.realtime_stats['chaff_rates']) > 0:
-            chaff_percentages = [cr*100 for cr in self.realtime_stats['chaff_rates']]
-            self.ax2.plot(range(len(chaff_percentages)), chaff_percentages, 'bo-', linewidth=2, markersize=6)
-            self.ax2.fill_between(range(len(chaff_percentages)), chaff_percentages, alpha=0.3, color='blue')
+        chaff_percentages = self.realtime_stats['chaff_rates'][:n] * 100
+        self.chaff_line.set_data(x, chaff_percentages)
+        self.chaff_fill = self._replace_fill(self.ax2, self.chaff_fill, x, chaff_percentages, 'blue')
+        self.chaff_text.set_text(f'Current: {chaff_percentages[-1]:.1f}%')
         
-        self.ax2.set_title('Chaff Injection Rate', fontsize=14, fontweight='bold')
-        self.ax2.set_xlabel('Time Steps')
-        self.ax2.set_ylabel('Chaff Rate (%)')
-        self.ax2.grid(True, alpha=0.3)
-        self.ax2.set_ylim(0, 100)
+        # Plot 3: Location points
+        self.real_scat.set_offsets(self.live_real_locs.valid())
+        self.chaff_scat.set_offsets(self.live_chaff_locs.valid())
         
-        # Add current chaff rate text
-        if self.realtime_stats['chaff_rates']:
-            current_chaff = self.realtime_stats['chaff_rates'][-1] * 100
-            self.ax2.text(0.02, 0.98, f'Current: {current_chaff:.1f}%', 
-                         transform=self.ax2.transAxes, fontsize=12, 
-                         verticalalignment='top', fontweight='bold',
-                         bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+        # Plot 4: Terminal feed
+        for text, (message, color) in zip(self.term_texts, reversed(self.terminal_feed)):
+            text.set_text(message)
+            text.set_color(color)
         
-        # Plot 3: Location visualization with map background
-        self.ax3.set_xlim(self.min_lon, self.max_lon)
-        self.ax3.set_ylim(self.min_lat, self.max_lat)
+        return [self.acc_fill, self.acc_line, self.acc_text,
+                self.chaff_fill, self.chaff_line, self.chaff_text,
+                self.chaff_scat, self.real_scat, *self.term_texts]
+    
+    def _init_plots(self):
+        """FuncAnimation init: nothing to draw until the first stats sample"""
+        return []
+    
+    def _simulate_step(self, step, total_steps, chaff_schedule, current_time):
+        """Advance the simulation one step, testing the T&T system every other step"""
+        # Update chaff rate based on schedule
+        old_chaff_rate = self.current_chaff_rate
+        progress = step / total_steps
+        for phase_progress, chaff_rate in chaff_schedule:
+            if progress >= phase_progress:
+                self.current_chaff_rate = chaff_rate
+        
+        # Log chaff rate changes
+        if self.current_chaff_rate != old_chaff_rate:
+            self.add_terminal_message("CHAFF", f"Rate changed to {self.current_chaff_rate*100:.0f}%")
+        
+        # Generate pings for this time step
+        self.total_data_points += self.simulate_time_step(current_time)
+        
+        # Test T&T system every few steps
+        if step % 2 == 0:  # Test every minute
+            tp_rate, fp_rate = self.targeting_tracking_system()
+            
+            # Store stats
+            i = self.stats_count
+            self.realtime_stats['timestamps'][i] = current_time.timestamp()
+            self.realtime_stats['true_positive_rates'][i] = tp_rate
+            self.realtime_stats['false_positive_rates'][i] = fp_rate
+            self.realtime_stats['chaff_rates'][i] = self.current_chaff_rate
+            self.realtime_stats['data_points_processed'][i] = self.total_data_points
+            self.stats_count = i + 1
+            
+            # Print status update with sample tracking data
+            if step % 15 == 0:  # Print every 7.5 minutes for slower simulation
+                elapsed_minutes = step * 0.5
+                print(f"   {elapsed_minutes:.1f}min - Chaff: {self.current_chaff_rate*100:.0f}% - T&T Accuracy: {tp_rate*100:.1f}% - Data Points: {self.total_data_points:,}")
+                self.add_terminal_message("STATUS", f"{elapsed_minutes:.1f}min elapsed, {self.total_data_points:,} data points")
+    
+    def _simulation_steps(self, total_steps, chaff_schedule, plot_every=4):
+        """
+        Run the simulation, yielding every plot_every steps
         
-        # Re-add map background
-        if self.map_image:
-            self.ax3.imshow(self.map_image, extent=[self.min_lon, self.max_lon, self.min_lat, self.max_lat], 
-                           aspect='auto', alpha=0.7, zorder=0)
+        Drives the FuncAnimation: every yielded step becomes one redrawn frame.
+        Steps in between still run, but never reach the animation callback.
+        """
+        start_time = datetime.now()
+        time_step = timedelta(seconds=30)  # 30-second steps for smoother animation
+        current_time = start_time
+        self.total_data_points = 0
         
-        # Add location points on top of map
-        if self.live_real_locs['lons']:
-            self.ax3.scatter(self.live_real_locs['lons'], self.live_real_locs['lats'], 
-                           c='blue', alpha=0.8, s=25, label='Real Locations', zorder=2, edgecolors='white', linewidth=0.5)
+        for step in range(total_steps):
+            self._simulate_step(step, total_steps, chaff_schedule, current_time)
+            
+            # Update plots
+            if step % plot_every == 0:
+                yield step
+            
+            current_time += time_step
         
-        if self.live_chaff_locs['lons']:
-            self.ax3.scatter(self.live_chaff_locs['lons'], self.live_chaff_locs['lats'], 
-                           c='red', alpha=0.6, s=20, label='Chaff Locations', zorder=1, edgecolors='white', linewidth=0.5)
+        self._finish_simulation(self.total_data_points)
         
-        self.ax3.set_title(f'Live Location Pings - {self.map_filename}', fontsize=14, fontweight='bold')
-        self.ax3.set_xlabel('Longitude')
-        self.ax3.set_ylabel('Latitude')
-        self.ax3.legend()
+        # Update plots one final time
+        yield total_steps
+    
+    def _finish_simulation(self, total_data_points):
+        """Report the final results once the last step has run"""
+        self.simulation_complete = True
+        self.add_terminal_message("SIMULATION", "Complete!")
         
-        # Plot 4: Update terminal feed
-        self.ax4.clear()
-        self.ax4.set_xlim(0, 1)
-        self.ax4.set_ylim(0, 1)
-        self.ax4.axis('off')
-        self.ax4.set_facecolor('black')
+        print("\n✅ Simulation complete! Final results:")
         
-        # Display terminal messages
-        line_height = 1.0 / self.max_terminal_lines
-        for i, message in enumerate(reversed(self.terminal_feed[-self.max_terminal_lines:])):
-            y_pos = 0.95 - (i * line_height)
+        if self.stats_count:
+            tp_rates = self.realtime_stats['true_positive_rates'][:self.stats_count]
+            final_accuracy = tp_rates[-1] * 100
+            min_accuracy = tp_rates.min() * 100
+            max_reduction = 100 - min_accuracy
             
-            # Color code different message types
-            color = 'white'
-            if 'CHAFF:' in message:
-                color = '#ff6b6b'  # Light red
-            elif 'REAL:' in message:
-                color = '#74c0fc'  # Light blue
-            elif 'T&T:' in message:
-                color = '#ffd43b'  # Yellow
-            elif 'MITHRIL:' in message:
-                color = '#51cf66'  # Green
-            elif 'MAP:' in message:
-                color = '#ff8cc8'  # Pink
+            print(f"   • Final T&T accuracy: {final_accuracy:.1f}%")
+            print(f"   • Maximum accuracy reduction: {max_reduction:.1f}%")
+            print(f"   • Total data points processed: {total_data_points:,}")
+            print(f"   • Protection effectiveness: {min(max_reduction, 99.9):.1f}%")
             
-            self.ax4.text(0.02, y_pos, message, transform=self.ax4.transAxes, 
-                         fontsize=9, fontfamily='monospace', color=color,
-                         verticalalignment='top')
+            self.add_terminal_message("RESULTS", f"Max reduction {max_reduction:.1f}%, Final accuracy {final_accuracy:.1f}%")
+            
+            print(f"\n🎯 SURVEILLANCE SYSTEMS CONFUSED:")
+            # Count all unique services across all tracking identities
+            active_services = {service for person in self.population for service in person['id_services']}
+            service_list = list(active_services)
+            print(f"   • Tracking services affected: {', '.join(service_list[:3])}... ({len(active_services)} total)")
         
-        plt.tight_layout()
-        plt.draw()
-        plt.pause(0.01)  # Small pause to allow GUI update
+        print(f"\n🗺️  Map used: {self.map_filename}")
+        print("🎯 Keep the window open to examine the results, then close to proceed to next simulation!")
     
-    def run_realtime_simulation(self, duration_minutes=10, chaff_schedule=None):
-        """Run real-time simulation with live visualization"""
+    def run_realtime_simulation(self, duration_minutes=10, chaff_schedule=None, plot_every=4, step_seconds=1.5):
+        """
+        Run real-time simulation with live visualization
+        plot_every: Redraw the plots every this many simulation steps
+        step_seconds: Wall-clock time per simulation step, slowed down for observing the traffic
+        """
         print(f"🛡️  PROJECT MITHRIL: Real-Time Cloaking Demonstration - {self.map_filename}")
         print("=" * 60)
         print("🎯 Simulating realistic ad tracking with major surveillance platforms...")
@@ -596,14 +737,12 @@ class MithrilRealtimeDemo:
                 (0.9, 0.0),    # Back to 0% to show recovery
             ]
         
-        self.setup_realtime_plots()
-        
-        start_time = datetime.now()
-        time_step = timedelta(seconds=30)  # 30-second steps for smoother animation
-        current_time = start_time
-        
         total_steps = int(duration_minutes * 60 / 30)  # 30-second steps
-        total_data_points = 0
+        
+        # One stats sample every other step
+        num_points = (total_steps + 1) // 2
+        self._allocate_stats(num_points)
+        self.setup_realtime_plots(num_points=num_points)
         
         print(f"🚀 Starting {duration_minutes}-minute detailed surveillance observation...")
         print("📊 Watch how chaff injection confuses tracking systems in real-time!")
@@ -611,81 +750,18 @@ class MithrilRealtimeDemo:
         print("⏱️  Slower paced for detailed observation of tracking patterns...")
         print("\n⏱️  Live Status Updates:")
         
-        self.add_terminal_message("SIMULATION: Starting real-time demo")
-        
-        for step in range(total_steps):
-            # Update chaff rate based on schedule
-            old_chaff_rate = self.current_chaff_rate
-            progress = step / total_steps
-            for phase_progress, chaff_rate in chaff_schedule:
-                if progress >= phase_progress:
-                    self.current_chaff_rate = chaff_rate
-            
-            # Log chaff rate changes
-            if self.current_chaff_rate != old_chaff_rate:
-                self.add_terminal_message(f"CHAFF: Rate changed to {self.current_chaff_rate*100:.0f}%")
-            
-            # Generate pings for this time step
-            pings = self.simulate_time_step(current_time)
-            total_data_points += len(pings)
-            
-            # Test T&T system every few steps
-            if step % 2 == 0:  # Test every minute
-                tp_rate, fp_rate = self.targeting_tracking_system()
-                
-                # Store stats
-                self.realtime_stats['timestamps'].append(current_time)
-                self.realtime_stats['true_positive_rates'].append(tp_rate)
-                self.realtime_stats['false_positive_rates'].append(fp_rate)
-                self.realtime_stats['chaff_rates'].append(self.current_chaff_rate)
-                self.realtime_stats['data_points_processed'].append(total_data_points)
-                
-                # Update plots
-                self.update_plots()
-                
-                # Print status update with sample tracking data
-                if step % 15 == 0:  # Print every 7.5 minutes for slower simulation
-                    elapsed_minutes = step * 0.5
-                    print(f"   {elapsed_minutes:.1f}min - Chaff: {self.current_chaff_rate*100:.0f}% - T&T Accuracy: {tp_rate*100:.1f}% - Data Points: {total_data_points:,}")
-                    self.add_terminal_message(f"STATUS: {elapsed_minutes:.1f}min elapsed, {total_data_points:,} data points")
-            
-            current_time += time_step
-            time.sleep(1.5)  # Slow down 5x for better observation of surveillance traffic
-        
-        self.simulation_complete = True
-        self.add_terminal_message("SIMULATION: Complete!")
-        
-        print("\n✅ Simulation complete! Final results:")
+        self.add_terminal_message("SIMULATION", "Starting real-time demo")
         
-        if self.realtime_stats['true_positive_rates']:
-            final_accuracy = self.realtime_stats['true_positive_rates'][-1] * 100
-            min_accuracy = min(self.realtime_stats['true_positive_rates']) * 100
-            max_reduction = 100 - min_accuracy
-            
-            print(f"   • Final T&T accuracy: {final_accuracy:.1f}%")
-            print(f"   • Maximum accuracy reduction: {max_reduction:.1f}%")
-            print(f"   • Total data points processed: {total_data_points:,}")
-            print(f"   • Protection effectiveness: {min(max_reduction, 99.9):.1f}%")
-            
-            self.add_terminal_message(f"RESULTS: Max reduction {max_reduction:.1f}%, Final accuracy {final_accuracy:.1f}%")
-            
-            print(f"\n🎯 SURVEILLANCE SYSTEMS CONFUSED:")
-            # Count all unique services across all tracking identities
-            active_services = set()
-            for person in self.population:
-                for identity in person['tracking_identities']:
-                    active_services.add(identity['service'])
-            service_list = list(active_services)
-            print(f"   • Tracking services affected: {', '.join(service_list[:3])}... ({len(active_services)} total)")
-        
-        print(f"\n🗺️  Map used: {self.map_filename}")
-        print("🎯 Keep the window open to examine the results, then close to proceed to next simulation!")
-        
-        # Update plots one final time
-        self.update_plots()
+        # Blitted animation: only the artists update_plots returns are redrawn each frame.
+        # The animation timer paces the run, so the window stays responsive between frames.
+        self.anim = animation.FuncAnimation(
+            self.fig, lambda step: self.update_plots(),
+            frames=self._simulation_steps(total_steps, chaff_schedule, plot_every),
+            init_func=self._init_plots, blit=True, interval=int(step_seconds * 1000 * plot_every),
+            repeat=False, cache_frame_data=False
+        )
         
-        # Keep plot window open for viewing
-        plt.ioff()
+        # The simulation runs while the window is open; keep it open to view the results
         plt.show()
 
 def main():
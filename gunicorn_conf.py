@@ -0,0 +1,33 @@
+"""
+gunicorn configuration for the API server
+
+    PYTHONOPTIMIZE=2 gunicorn -c gunicorn_conf.py wsgi:application
+
+Every endpoint is I/O-bound (Redis, downstream services), so gevent workers let
+each process overlap many requests. wsgi.py monkey-patches before the app is
+imported. Patching only makes pure-Python socket I/O cooperative: C extensions
+that block on their own (or long numpy work in handlers) still stall the whole
+worker while they run.
+"""
+
+import multiprocessing
+import os
+
+import config
+
+bind = f"0.0.0.0:{config.API_PORT}"
+worker_class = "gevent"
+workers = 2 * multiprocessing.cpu_count() + 1
+worker_connections = 1000
+
+# Import the app once in the master so constant payloads (docs, probes) are
+# built once and shared copy-on-write across workers
+preload_app = True
+
+def post_fork(server, worker):
+    """Name this worker's Redis connections after its own pid rather than the master's"""
+    import utils
+    pool = getattr(utils.redis_client, 'connection_pool', None)
+    if pool is not None:
+        # The pool resets itself on first use after the fork, so every new connection picks this up
+        pool.connection_kwargs['client_name'] = f"naraapi-{os.getpid()}"
@@ -2,16 +2,68 @@
 Handlers for data querying, filtering, redaction and differential privacy
 """
 
-import json
+import orjson
 import re
+import time
+import hashlib
 import random
 import numpy as np
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Any, Tuple, Union
 import redis
 
-# Initialize Redis client
-redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+# Initialize Redis client. Replies stay as bytes: orjson parses them directly, skipping a UTF-8 decode
+redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=False)
+
+# Upper bound on LRANGE commands per pipeline, so long date ranges don't buffer unboundedly
+ARCHIVE_PIPELINE_BATCH = 500
+
+# Returns the raw entries of the KEYS lists that pass the equality filters in ARGV.
+# Only drops entries it can decode and rule out; everything else is left for the Python check.
+_ARCHIVE_FILTER_LUA = """
+local matches = {}
+for _, key in ipairs(KEYS) do
+    for _, raw in ipairs(redis.call('LRANGE', key, 0, -1)) do
+        local ok, item = pcall(cjson.decode, raw)
+        local keep = true
+        if ok and type(item) == 'table' then
+            for i = 1, #ARGV, 3 do
+                local value = item[ARGV[i]]
+                local wanted = ARGV[i + 2]
+                if ARGV[i + 1] == 'n' then
+                    wanted = tonumber(wanted)
+                    -- Python compares True == 1, so booleans count as numbers here
+                    if type(value) == 'boolean' then
+                        value = value and 1 or 0
+                    end
+                end
+                if value ~= wanted then
+                    keep = false
+                    break
+                end
+            end
+        end
+        if keep then
+            matches[#matches + 1] = raw
+        end
+    end
+end
+return matches
+"""
+_archive_filter_script = redis_client.register_script(_ARCHIVE_FILTER_LUA)
+
+# Cache-aside for query_archives. Archives have no write path here, so entries simply expire.
+QUERY_CACHE_TTL = 60
+QUERY_CACHE_LOCK_TTL = 30  # Frees the lock if the computing worker dies
+QUERY_CACHE_WAIT_POLLS = 20
+QUERY_CACHE_WAIT_INTERVAL = 0.05
+
+# Name pattern - simplistic example, real implementation would be more sophisticated
+_NAME_RE = re.compile(r'\b[A-Z][a-z]+ [A-Z][a-z]+\b', re.ASCII)  # First Last format
+_DEFAULT_REDACT_FIELDS = frozenset({'name', 'full_name', 'username'})
+
+# Shared generator for differential privacy noise
+_rng = np.random.default_rng()
 
 def query_archives(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """
@@ -29,67 +81,222 @@ def query_archives(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     - Tuple of (response_data, status_code)
     """
     try:
-        # Extract parameters
-        query_type = data.get('query_type', 'full')
-        time_range = data.get('time_range', {})
-        filters = data.get('filters', {})
-        limit = int(data.get('limit', 100))
-        offset = int(data.get('offset', 0))
-        
-        # Validate time range
-        start_time = time_range.get('start', 0)
-        end_time = time_range.get('end', int(datetime.now().timestamp()))
-        
-        # Build Redis query
-        # This is a simplified example - in a real application, 
-        # you might use more sophisticated data storage and retrieval
-        
-        # Get keys for the date range
-        keys = []
-        current_time = start_time
-        while current_time <= end_time:
-            date_str = datetime.fromtimestamp(current_time).strftime('%Y-%m-%d')
-            keys.append(f"archive:{date_str}")
-            # Move to next day
-            current_time += 86400  # seconds in a day
-        
-        # Fetch and filter data
-        results = []
-        for key in keys:
-            if redis_client.exists(key):
-                archive_data = redis_client.lrange(key, 0, -1)
-                for item_json in archive_data:
-                    try:
-                        item = json.loads(item_json)
-                        # Apply filters
-                        if all(item.get(k) == v for k, v in filters.items()):
-                            results.append(item)
-                    except json.JSONDecodeError:
-                        continue
-        
-        # Apply pagination
-        paginated_results = results[offset:offset+limit]
-        
-        # Format based on query type
-        if query_type == 'count':
-            response = {'count': len(results)}
-        elif query_type == 'summary':
-            response = {
-                'count': len(results),
-                'summary': [{'id': item.get('id'), 'timestamp': item.get('timestamp')} 
-                           for item in paginated_results]
-            }
-        else:  # full
-            response = {
-                'count': len(results),
-                'data': paginated_results
-            }
+        cache_key = _query_cache_key(data)
+        cached = redis_client.get(cache_key)
+        if cached:
+            return orjson.loads(cached), 200
+        
+        # Only one worker recomputes a missed query; the rest briefly wait for its result
+        lock_key = cache_key + ':lock'
+        got_lock = redis_client.set(lock_key, '1', nx=True, ex=QUERY_CACHE_LOCK_TTL)
+        if not got_lock:
+            for _ in range(QUERY_CACHE_WAIT_POLLS):
+                time.sleep(QUERY_CACHE_WAIT_INTERVAL)
+                cached = redis_client.get(cache_key)
+                if cached:
+                    return orjson.loads(cached), 200
+        
+        try:
+            response = _run_archive_query(data)
+            redis_client.setex(cache_key, QUERY_CACHE_TTL, orjson.dumps(response))
+        finally:
+            if got_lock:
+                redis_client.delete(lock_key)
         
         return response, 200
         
     except Exception as e:
         return {"error": str(e)}, 500
 
+def _query_cache_key(data: Dict[str, Any]) -> str:
+    """Cache key for a query: a digest of its canonical JSON parameters"""
+    canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return 'qcache:' + hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+def _run_archive_query(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Run an archive query against Redis; see query_archives for the parameters"""
+    # Extract parameters
+    query_type = data.get('query_type', 'full')
+    time_range = data.get('time_range', {})
+    filters = data.get('filters', {})
+    limit = int(data.get('limit', 100))
+    offset = int(data.get('offset', 0))
+    
+    # Validate time range
+    start_time = time_range.get('start', 0)
+    end_time = time_range.get('end', int(datetime.now().timestamp()))
+    
+    # Build Redis query
+    # This is a simplified example - in a real application, 
+    # you might use more sophisticated data storage and retrieval
+    
+    # Get keys for the date range: one per 86400s step from start_time, dated by date arithmetic
+    # so only the first day goes through fromtimestamp
+    num_days = int((end_time - start_time) // 86400) + 1 if end_time >= start_time else 0
+    start_date = date.fromtimestamp(start_time)
+    keys = [f"archive:{(start_date + timedelta(days=i)).isoformat()}" for i in range(num_days)]
+    
+    # Equality filters on plain values run inside Redis so non-matching items never
+    # cross the network; anything else falls back to fetching whole days
+    filter_args = _lua_filter_args(filters) if filters else None
+    
+    # Every match is counted, but only those up to the end of the requested page are kept.
+    # Negative offsets/limits keep everything so slicing behaves as before.
+    if query_type == 'count':
+        keep = 0
+    elif offset >= 0 and limit >= 0:
+        keep = offset + limit
+    else:
+        keep = None
+    
+    matches = _equality_matcher(filters)
+    
+    results = []
+    match_count = 0
+    for raw_entries in _fetch_archive_batches(keys, filter_args):
+        for item in _decode_archive_entries(raw_entries):
+            # Apply filters
+            if matches(item):
+                match_count += 1
+                if keep is None or len(results) < keep:
+                    results.append(item)
+    
+    # Apply pagination
+    paginated_results = results[offset:offset+limit]
+    
+    # Format based on query type
+    if query_type == 'count':
+        response = {'count': match_count}
+    elif query_type == 'summary':
+        response = {
+            'count': match_count,
+            'summary': [{'id': item.get('id'), 'timestamp': item.get('timestamp')} 
+                       for item in paginated_results]
+        }
+    else:  # full
+        response = {
+            'count': match_count,
+            'data': paginated_results
+        }
+    
+    return response
+
+def _equality_matcher(filters: Dict[str, Any]):
+    """Build a predicate for item.get(k) == v over all filters, specialised for 0 or 1 filter"""
+    filter_items = tuple(filters.items())
+    if not filter_items:
+        return lambda item: True
+    if len(filter_items) == 1:
+        (field, value), = filter_items
+        return lambda item: item.get(field) == value
+    return lambda item: all(item.get(k) == v for k, v in filter_items)
+
+def _lua_filter_args(filters: Dict[str, Any]) -> Union[List[str], None]:
+    """
+    Flatten equality filters into (field, type, value) ARGV triples for the archive Lua script
+    
+    Returns None if any filter value is not a string or number, since those can't be
+    compared faithfully in Lua and the query has to filter in Python instead.
+    """
+    args = []
+    for field, value in filters.items():
+        if isinstance(value, str):
+            args.extend((field, 's', value))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            args.extend((field, 'n', repr(value)))
+        else:
+            return None
+    return args
+
+def _fetch_archive_batches(keys: List[str], filter_args: Union[List[str], None]):
+    """
+    Yield lists of raw archive entries for the given day keys, one list per batch, in day order
+    
+    With filter_args, each batch is one EVALSHA that returns only candidate matches.
+    Without, each batch is one pipeline of LRANGEs; LRANGE on a missing key is just [].
+    """
+    for batch_start in range(0, len(keys), ARCHIVE_PIPELINE_BATCH):
+        batch = keys[batch_start:batch_start + ARCHIVE_PIPELINE_BATCH]
+        if filter_args is not None:
+            yield _archive_filter_script(keys=batch, args=filter_args)
+        else:
+            pipe = redis_client.pipeline(transaction=False)
+            for key in batch:
+                pipe.lrange(key, 0, -1)
+            yield [raw for archive_data in pipe.execute() for raw in archive_data]
+
+def _decode_archive_entries(raw_entries: List[bytes]) -> List[Any]:
+    """
+    Decode a batch of raw archive entries, skipping malformed ones
+    
+    When every entry looks like a whole JSON object, the batch is spliced into one JSON
+    array so orjson parses it in a single call. Otherwise, or if that parse fails or
+    yields a different item count, entries are decoded one by one.
+    """
+    if not raw_entries:
+        return []
+    # Fragments such as b'[1', b'2]' would splice into valid JSON, so only objects qualify
+    if all(raw[:1] == b'{' and raw[-1:] == b'}' for raw in raw_entries):
+        try:
+            items = orjson.loads(b'[' + b','.join(raw_entries) + b']')
+            if len(items) == len(raw_entries):
+                return items
+        except orjson.JSONDecodeError:
+            pass
+    
+    items = []
+    for item_json in raw_entries:
+        try:
+            items.append(orjson.loads(item_json))
+        except orjson.JSONDecodeError:
+            continue
+    return items
+
+_NO_BOUND = object()
+
+def _compile_field_rules(field_rules: Dict[str, Dict[str, Any]]) -> List[Tuple]:
+    """
+    Turn apply_filters field rules into flat (field, min, max, regex, allowed) checks
+    
+    Missing range bounds are _NO_BOUND, and a missing regex or membership list is None,
+    so per-item evaluation never has to look inside the rule dicts.
+    """
+    checks = []
+    for field, rules in field_rules.items():
+        range_rule = rules.get('range', {})
+        regex = rules.get('regex')
+        checks.append((
+            field,
+            range_rule.get('min', _NO_BOUND),
+            range_rule.get('max', _NO_BOUND),
+            re.compile(regex) if regex is not None else None,
+            rules.get('in')
+        ))
+    return checks
+
+def _passes_field_rules(item: Dict[str, Any], checks: List[Tuple]) -> bool:
+    """Check one item against compiled field rules"""
+    for field, min_value, max_value, regex, allowed in checks:
+        if field not in item:
+            return False
+        
+        field_value = item[field]
+        
+        # Range filter
+        if min_value is not _NO_BOUND and field_value < min_value:
+            return False
+        if max_value is not _NO_BOUND and field_value > max_value:
+            return False
+        
+        # Regex filter
+        if regex is not None and not regex.match(str(field_value)):
+            return False
+        
+        # List membership
+        if allowed is not None and field_value not in allowed:
+            return False
+    return True
+
 def apply_filters(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """
     Apply advanced filtering to query results
@@ -113,55 +320,23 @@ def apply_filters(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         exclude_fields = filters.get('exclude_fields', [])
         field_rules = filters.get('field_rules', {})
         
-        filtered_results = []
-        
-        for item in results:
-            # Apply field rules first
-            item_passes = True
-            
-            for field, rules in field_rules.items():
-                if field not in item:
-                    item_passes = False
-                    break
-                    
-                field_value = item[field]
-                
-                # Range filter
-                if 'range' in rules:
-                    range_rule = rules['range']
-                    if 'min' in range_rule and field_value < range_rule['min']:
-                        item_passes = False
-                        break
-                    if 'max' in range_rule and field_value > range_rule['max']:
-                        item_passes = False
-                        break
-                
-                # Regex filter
-                if 'regex' in rules and not re.match(rules['regex'], str(field_value)):
-                    item_passes = False
-                    break
-                    
-                # List membership
-                if 'in' in rules and field_value not in rules['in']:
-                    item_passes = False
-                    break
-            
-            if not item_passes:
-                continue
-                
-            # Create filtered item with selected fields
-            filtered_item = {}
-            
-            if include_fields:
-                # Only include specified fields
-                for field in include_fields:
-                    if field in item:
-                        filtered_item[field] = item[field]
-            else:
-                # Include all fields except excluded ones
-                filtered_item = {k: v for k, v in item.items() if k not in exclude_fields}
-            
-            filtered_results.append(filtered_item)
+        # Interpret the rules once, then run every item through the compiled checks
+        try:
+            checks = _compile_field_rules(field_rules)
+        except re.error as e:
+            return {"error": f"Invalid regex in field_rules: {e}"}, 400
+        survivors = [item for item in results if _passes_field_rules(item, checks)]
+        
+        # Create filtered items with selected fields
+        if include_fields:
+            # Only include specified fields
+            filtered_results = [{field: item[field] for field in include_fields if field in item}
+                                for item in survivors]
+        else:
+            # Include all fields except excluded ones
+            excluded = set(exclude_fields)
+            filtered_results = [{k: v for k, v in item.items() if k not in excluded}
+                                for item in survivors]
         
         return {'filtered_data': filtered_results, 'count': len(filtered_results)}, 200
         
@@ -178,18 +353,19 @@ def redact_names(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
         - fields_to_redact: List of fields that may contain names
         - redaction_character: Character to use for redaction (default: '*')
         - preserve_length: Whether to preserve the length of redacted names
+        - scan_fields: Optional list of the other fields to scan for names (default: all text fields)
     
     Returns:
     - Tuple of (redacted_data, status_code)
     """
     try:
         results = data.get('results', [])
-        fields_to_redact = data.get('fields_to_redact', ['name', 'full_name', 'username'])
+        fields_to_redact = frozenset(data.get('fields_to_redact', _DEFAULT_REDACT_FIELDS))
         redaction_char = data.get('redaction_character', '*')
         preserve_length = data.get('preserve_length', True)
-        
-        # Name pattern - simplistic example, real implementation would be more sophisticated
-        name_pattern = re.compile(r'\b[A-Z][a-z]+ [A-Z][a-z]+\b')  # First Last format
+        scan_fields = data.get('scan_fields')
+        if scan_fields is not None:
+            scan_fields = frozenset(scan_fields)
         
         redacted_results = []
         
@@ -205,9 +381,11 @@ def redact_names(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
                         redacted_value = '[REDACTED]'
                     redacted_item[key] = redacted_value
                     
-                elif isinstance(value, str) and not key in fields_to_redact:
-                    # Scan other text fields for names
-                    redacted_value = name_pattern.sub('[REDACTED]', value)
+                elif (isinstance(value, str) and (scan_fields is None or key in scan_fields)
+                      and ' ' in value and not value.islower()):
+                    # Scan other text fields for names; a First Last match needs
+                    # a space and an uppercase letter, so skip values without them
+                    redacted_value = _NAME_RE.sub('[REDACTED]', value)
                     redacted_item[key] = redacted_value
                     
                 else:
@@ -221,6 +399,33 @@ def redact_names(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     except Exception as e:
         return {"error": str(e)}, 500
 
+def _add_laplace_noise(items: List[Dict[str, Any]], numeric_fields: List[str], scale: float) -> None:
+    """
+    Add Laplace noise in place to the numeric fields of each item
+    
+    All noise for the batch is drawn in a single RNG call rather than one per value.
+    Fields that held ints are rounded back to ints.
+    """
+    fields = set(numeric_fields)
+    targets = [(item, key) for item in items for key in fields
+               if isinstance(item.get(key), (int, float))]
+    if not targets:
+        return
+    
+    values = np.fromiter((item[key] for item, key in targets), dtype=np.float64, count=len(targets))
+    is_int = np.fromiter((isinstance(item[key], int) for item, key in targets), dtype=bool, count=len(targets))
+    noisy = values + _rng.laplace(0.0, scale, size=len(targets))
+    
+    # Round only the int fields, in one pass, and write each group back without per-value branching
+    int_positions = np.flatnonzero(is_int)
+    float_positions = np.flatnonzero(~is_int)
+    for position, rounded_value in zip(int_positions.tolist(), np.rint(noisy[int_positions]).tolist()):
+        item, key = targets[position]
+        item[key] = int(rounded_value)
+    for position, noisy_value in zip(float_positions.tolist(), noisy[float_positions].tolist()):
+        item, key = targets[position]
+        item[key] = noisy_value
+
 def add_differential_privacy(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
     """
     Add differential privacy noise to numeric data
@@ -245,52 +450,19 @@ def add_differential_privacy(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]
         if epsilon <= 0:
             return {"error": "Epsilon must be positive"}, 400
             
+        scale = sensitivity / epsilon
+        
         # Determine if results is a list of objects or a single aggregate object
         if isinstance(results, list):
             # List of objects - add noise to each numeric field in each object
-            noisy_results = []
-            
-            for item in results:
-                noisy_item = {}
-                
-                for key, value in item.items():
-                    if key in numeric_fields and isinstance(value, (int, float)):
-                        # Add Laplace noise
-                        scale = sensitivity / epsilon
-                        noise = np.random.laplace(0, scale)
-                        noisy_value = value + noise
-                        
-                        # Round to appropriate precision if integer
-                        if isinstance(value, int):
-                            noisy_value = int(round(noisy_value))
-                            
-                        noisy_item[key] = noisy_value
-                    else:
-                        noisy_item[key] = value
-                        
-                noisy_results.append(noisy_item)
-                
+            noisy_results = [dict(item) for item in results]
+            _add_laplace_noise(noisy_results, numeric_fields, scale)
             result = {'privacy_protected_data': noisy_results, 'count': len(noisy_results)}
             
         else:
             # Aggregate object (e.g., counts, sums) - add noise to specified fields
-            noisy_results = {}
-            
-            for key, value in results.items():
-                if key in numeric_fields and isinstance(value, (int, float)):
-                    # Add Laplace noise
-                    scale = sensitivity / epsilon
-                    noise = np.random.laplace(0, scale)
-                    noisy_value = value + noise
-                    
-                    # Round to appropriate precision if integer
-                    if isinstance(value, int):
-                        noisy_value = int(round(noisy_value))
-                        
-                    noisy_results[key] = noisy_value
-                else:
-                    noisy_results[key] = value
-                    
+            noisy_results = dict(results)
+            _add_laplace_noise([noisy_results], numeric_fields, scale)
             result = {'privacy_protected_data': noisy_results}
         
         # Add metadata about privacy protection
@@ -346,7 +518,8 @@ def combined_query_with_privacy(data: Dict[str, Any]) -> Tuple[Dict[str, Any], i
             'results': filtered_result.get('filtered_data', []),
             'fields_to_redact': data.get('fields_to_redact', []),
             'redaction_character': data.get('redaction_character', '*'),
-            'preserve_length': data.get('preserve_length', True)
+            'preserve_length': data.get('preserve_length', True),
+            'scan_fields': data.get('scan_fields')
         }
         
         redacted_result, status = redact_names(redact_data)
@@ -16,17 +16,66 @@ Integration tests for the API server with visual feedback and summary stats
 ###########
 
 import unittest
+import argparse
+import atexit
+import os
+import hashlib
 import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import config
 import time
 import sys
+import threading
+import unicodedata
+import heapq
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 from termcolor import colored
 from utils import generate_token, store_token, redis_client
 
 # Base URL for API requests
 BASE_URL = f"http://localhost:{config.API_PORT}"
 
+# The test token is cached here so back-to-back runs skip creating one.
+# Tokens live 3600s, so a cached one is reused for at most one 55-minute window.
+FIXTURE_CACHE = Path.home() / ".cache" / "naraapi_test_fixture.json"
+FIXTURE_WINDOW = 3300
+TOKEN_TTL = 3600
+
+# Single-GET checks run by test_endpoint_probes:
+# (description, endpoint, authenticated, expected status, check(test, body) or None)
+ENDPOINT_PROBES = [
+    ("Testing server heartbeat", "/ping", False, 200,
+     lambda test, data: test.assertEqual(data["message"], "ok")),
+    ("Checking API health status", "/health", False, 200,
+     lambda test, data: test.assertIn("status", data)),
+    ("Checking privacy services health", "/api/privacy-services/health", False, 200,
+     lambda test, data: test.assertEqual(data["status"], "healthy")),
+    ("Checking privacy services health with a trailing slash", "/api/privacy-services/health/", False, 200,
+     lambda test, data: test.assertEqual(data["status"], "healthy")),
+    ("Fetching API docs with a trailing slash", "/api/docs/", False, 200, None),
+    ("Testing protected endpoint access WITHOUT token", "/api/metrics", False, 401, None),
+    ("Retrieving system metrics WITH valid token", "/api/metrics", True, 200,
+     lambda test, data: test.assertIn("metrics", data)),
+    ("Retrieving user profile", "/api/users/{username}", True, 200,
+     lambda test, data: test.assertEqual(data["username"], test.test_username)),
+]
+
+# Endpoints the remaining tests POST to
+POST_ENDPOINTS = ['/auth/login', '/auth/register', '/api/query', '/api/secure-query']
+
+# Passing tests stay quiet unless NARA_TEST_VERBOSE (or -v/--verbose, see __main__) asks for their full log
+VERBOSE = bool(os.environ.get('NARA_TEST_VERBOSE'))
+
+# Tests only read the shared class fixtures, so they run concurrently against the server
+TEST_WORKERS = 8
+
 # Enhanced emoji indicators
 EMOJI_SUCCESS = "✅"
 EMOJI_FAILURE = "❌"
@@ -43,11 +92,48 @@ EMOJI_ROCKET = "🚀"
 EMOJI_SECURITY = "🛡️"
 
 # Command line art elements
-BOX_TOP = "┏" + "━" * 70 + "┓"
-BOX_BOTTOM = "┗" + "━" * 70 + "┛"
+BOX_WIDTH = 70
+BOX_TOP = "┏" + "━" * BOX_WIDTH + "┓"
+BOX_BOTTOM = "┗" + "━" * BOX_WIDTH + "┛"
 BOX_LINE = "┃"
+BOX_EMPTY = BOX_LINE + " " * BOX_WIDTH + BOX_LINE
 SEPARATOR = "─" * 72
 
+# Piped output (CI logs, | tee) gets plain text instead of ANSI escapes; NO_COLOR opts out too
+USE_COLOR = sys.stdout.isatty() and os.environ.get('NO_COLOR') is None
+
+@lru_cache(maxsize=256)
+def paint(text, color, bold=False):
+    """colored(), memoized: labels, statuses and counts repeat across tests and rows"""
+    if not USE_COLOR:
+        return str(text)
+    return colored(text, color, attrs=['bold'] if bold else None)
+
+def display_width(text):
+    """Terminal columns text occupies: wide characters and emoji take two, combining marks none"""
+    width = 0
+    for ch in text:
+        if ch == "\ufe0f":
+            # Emoji presentation selector widens the preceding narrow symbol, e.g. ⏱️
+            width += 1
+        elif not unicodedata.combining(ch):
+            width += 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+    return width
+
+def box_row(*parts):
+    """
+    One ┃...┃ row of a box, padded to BOX_WIDTH
+    
+    parts are plain strings or (text, color, bold) tuples to colorize. Padding is
+    measured on the plain text, so ANSI color codes don't throw off the alignment.
+    """
+    plain = "".join(part if isinstance(part, str) else part[0] for part in parts)
+    body = "".join(part if isinstance(part, str) else paint(*part) for part in parts)
+    return f"{BOX_LINE}{body}{' ' * max(BOX_WIDTH - display_width(plain), 0)}{BOX_LINE}"
+
+# One finished test, as recorded for the summary
+ResultRow = namedtuple("ResultRow", ["name", "result", "duration"])
+
 class TestStats:
     """Track test statistics for summary reporting"""
     def __init__(self):
@@ -58,54 +144,95 @@ class TestStats:
         self.start_time = None
         self.end_time = None
         self.test_results = []
+        self.lock = threading.Lock()
     
     def add_result(self, test_name, result, duration):
-        self.test_results.append({
-            "name": test_name,
-            "result": result,
-            "duration": duration
-        })
-        self.total += 1
-        if result == "PASS":
-            self.passed += 1
-        elif result == "FAIL":
-            self.failed += 1
-        elif result == "SKIP":
-            self.skipped += 1
+        with self.lock:
+            self.test_results.append(ResultRow(test_name, result, duration))
+            self.total += 1
+            if result == "PASS":
+                self.passed += 1
+            elif result == "FAIL":
+                self.failed += 1
+            elif result == "SKIP":
+                self.skipped += 1
     
     def print_summary(self):
-        if not self.start_time or not self.end_time:
+        if self.start_time is None or self.end_time is None:
             return
             
-        total_time = self.end_time - self.start_time
+        # Timestamps are perf_counter_ns() readings
+        total_time = (self.end_time - self.start_time) / 1e9
         
-        print(f"\n{BOX_TOP}")
-        print(f"{BOX_LINE} {EMOJI_ROCKET} {colored('TEST SUMMARY', 'cyan', attrs=['bold'])} {' ' * 54}{BOX_LINE}")
-        print(f"{BOX_LINE}{' ' * 70}{BOX_LINE}")
-        print(f"{BOX_LINE} Total Tests: {colored(self.total, 'white', attrs=['bold'])} {' ' * 55}{BOX_LINE}")
-        print(f"{BOX_LINE} Passed:      {colored(self.passed, 'green', attrs=['bold'])} {' ' * 55}{BOX_LINE}")
-        print(f"{BOX_LINE} Failed:      {colored(self.failed, 'red', attrs=['bold'])} {' ' * 55}{BOX_LINE}")
-        print(f"{BOX_LINE} Skipped:     {colored(self.skipped, 'yellow', attrs=['bold'])} {' ' * 55}{BOX_LINE}")
-        print(f"{BOX_LINE} Total Time:  {colored(f'{total_time:.2f}s', 'blue', attrs=['bold'])} {' ' * 51}{BOX_LINE}")
-        print(f"{BOX_LINE}{' ' * 70}{BOX_LINE}")
+        lines = [f"\n{BOX_TOP}"]
+        lines.append(box_row(f" {EMOJI_ROCKET} ", ('TEST SUMMARY', 'cyan', True)))
+        lines.append(BOX_EMPTY)
+        lines.append(box_row(" Total Tests: ", (str(self.total), 'white', True)))
+        lines.append(box_row(" Passed:      ", (str(self.passed), 'green', True)))
+        lines.append(box_row(" Failed:      ", (str(self.failed), 'red', True)))
+        lines.append(box_row(" Skipped:     ", (str(self.skipped), 'yellow', True)))
+        lines.append(box_row(" Total Time:  ", (f'{total_time:.2f}s', 'blue', True)))
+        lines.append(BOX_EMPTY)
         
         # Show performance stats
-        print(f"{BOX_LINE} {EMOJI_TIME} {colored('TEST PERFORMANCE', 'cyan', attrs=['bold'])} {' ' * 50}{BOX_LINE}")
-        print(f"{BOX_LINE}{' ' * 70}{BOX_LINE}")
+        lines.append(box_row(f" {EMOJI_TIME} ", ('TEST PERFORMANCE', 'cyan', True)))
+        lines.append(BOX_EMPTY)
         
-        # Sort tests by duration
-        sorted_results = sorted(self.test_results, key=lambda x: x["duration"], reverse=True)
-        for i, test in enumerate(sorted_results[:5]):
-            name = test["name"][:40].ljust(40)
-            result_color = "green" if test["result"] == "PASS" else "red"
-            result_text = colored(f"{test['result']}", result_color)
-            duration = colored(f"{test['duration']:.3f}s", "blue")
-            print(f"{BOX_LINE} {i+1}. {name} {result_text} {duration} {' ' * (18 - len(test['result']))}{BOX_LINE}")
+        # Five slowest tests, without sorting the rest
+        slowest = heapq.nlargest(5, self.test_results, key=attrgetter("duration"))
+        for i, test in enumerate(slowest):
+            result_color = "green" if test.result == "PASS" else "red"
+            lines.append(box_row(f" {i+1}. {test.name:<40.40} ", (test.result, result_color, False),
+                                 " ", (f"{test.duration:.3f}s", 'blue', False)))
             
-        print(f"{BOX_BOTTOM}")
+        lines.append(f"{BOX_BOTTOM}")
+        
+        # One write for the whole box
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 # Global stats tracker
 test_stats = TestStats()
+# Serializes each test's batched output
+output_lock = threading.Lock()
+
+def _locked(method):
+    """Wrap a TestResult method so concurrent tests update the result one at a time"""
+    def wrapper(self, *args):
+        with self._lock:
+            return method(self, *args)
+    return wrapper
+
+class LockedTextTestResult(unittest.TextTestResult):
+    """TextTestResult that is safe to report into from several test threads"""
+    _lock = threading.RLock()
+    startTest = _locked(unittest.TextTestResult.startTest)
+    stopTest = _locked(unittest.TextTestResult.stopTest)
+    addSuccess = _locked(unittest.TextTestResult.addSuccess)
+    addFailure = _locked(unittest.TextTestResult.addFailure)
+    addError = _locked(unittest.TextTestResult.addError)
+    addSkip = _locked(unittest.TextTestResult.addSkip)
+
+class ConcurrentTestSuite(unittest.TestSuite):
+    """
+    Runs one TestCase class's tests on a thread pool
+    
+    The tests are I/O-bound HTTP calls, so overlapping them makes the suite take
+    about as long as its slowest test rather than the sum of all of them.
+    setUpClass/tearDownClass still run once, around the whole batch.
+    """
+    def run(self, result, debug=False):
+        tests = list(self)
+        if not tests:
+            return result
+        test_class = type(tests[0])
+        test_class.setUpClass()
+        try:
+            with ThreadPoolExecutor(max_workers=TEST_WORKERS) as pool:
+                list(pool.map(lambda test: test(result), tests))
+        finally:
+            test_class.tearDownClass()
+        return result
 
 class APIIntegrationTests(unittest.TestCase):
     """Test cases for API server endpoints with visual feedback"""
@@ -113,42 +240,92 @@ class APIIntegrationTests(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Setup test environment once before all tests"""
-        test_stats.start_time = time.time()
+        test_stats.start_time = time.perf_counter_ns()
         
         print(f"\n{BOX_TOP}")
-        print(f"{BOX_LINE} {EMOJI_ROCKET} {colored('API INTEGRATION TESTS', 'cyan', attrs=['bold'])} {' ' * 50}{BOX_LINE}")
+        print(box_row(f" {EMOJI_ROCKET} ", ('API INTEGRATION TESTS', 'cyan', True)))
         print(f"{BOX_BOTTOM}")
         
-        # Create a test user and token
+        # One pooled keep-alive session for every request, sized for the concurrent tests
+        cls.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(32, TEST_WORKERS),
+                              max_retries=Retry(total=3, backoff_factor=0.1))
+        cls.session.mount('http://', adapter)
+        
+        # Check server availability
+        cls._wait_for_server()
+        
+        # Reuse this window's cached test token if the server still accepts it, else create one
         cls.test_username = "testuser"
-        cls.test_token = generate_token()
-        store_token(cls.test_username, cls.test_token, expires_in=3600)
-        print(f"{EMOJI_AUTH} Created test token for user: {colored(cls.test_username, 'cyan')}")
+        cls._tokens_to_cleanup = []
+        # Also reap on Ctrl-C or a crash, when tearDownClass never runs
+        atexit.register(cls._remove_tokens)
+        cache_key = hashlib.sha256(f"{BASE_URL}|{int(time.time() // FIXTURE_WINDOW)}".encode()).hexdigest()
+        cls.test_token = cls._load_cached_token(cache_key)
+        if cls.test_token:
+            print(f"{EMOJI_AUTH} Reusing cached test token for user: {paint(cls.test_username, 'cyan')}")
+        else:
+            cls.test_token = generate_token()
+            store_token(cls.test_username, cls.test_token, expires_in=TOKEN_TTL)
+            # Cached tokens are left to expire so later runs can use them
+            if not cls._cache_token(cache_key, cls.test_token):
+                cls._tokens_to_cleanup.append(cls.test_token)
+            print(f"{EMOJI_AUTH} Created test token for user: {paint(cls.test_username, 'cyan')}")
         
-        # Headers for authenticated requests
+        # Headers for authenticated requests; requests sets Content-Type itself for json= bodies
         cls.auth_headers = {
-            "Content-Type": "application/json",
             "Authorization": f"Bearer {cls.test_token}"
         }
         
         # Headers for unauthenticated requests
-        cls.headers = {
-            "Content-Type": "application/json"
-        }
+        cls.headers = {}
         
-        # Check server availability
-        cls._wait_for_server()
+        # Full URLs for every endpoint the tests hit, keyed by endpoint (templates filled in once)
+        endpoints = [probe[1] for probe in ENDPOINT_PROBES] + POST_ENDPOINTS
+        cls.urls = {endpoint: BASE_URL + endpoint.format(username=cls.test_username) for endpoint in endpoints}
+    
+    @classmethod
+    def _load_cached_token(cls, cache_key):
+        """Return the token cached under cache_key if the server still accepts it, else None"""
+        try:
+            entry = json.loads(FIXTURE_CACHE.read_text()).get(cache_key)
+        except (OSError, ValueError):
+            return None
+        if not entry or entry.get("username") != cls.test_username:
+            return None
+        
+        # The token may have been revoked or flushed from Redis since it was cached
+        try:
+            response = cls.session.get(f"{BASE_URL}/api/metrics",
+                                       headers={"Authorization": f"Bearer {entry['token']}"}, timeout=3)
+        except requests.RequestException:
+            return None
+        return entry["token"] if response.status_code == 200 else None
+    
+    @classmethod
+    def _cache_token(cls, cache_key, token):
+        """Save the token for this window, replacing older entries; returns False if it can't be written"""
+        try:
+            FIXTURE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            FIXTURE_CACHE.touch(mode=0o600)
+            FIXTURE_CACHE.write_text(json.dumps({cache_key: {"username": cls.test_username, "token": token}}))
+            return True
+        except OSError:
+            return False
     
     @classmethod
     def _wait_for_server(cls):
         """Wait for the server to be ready"""
         print(f"{EMOJI_SERVER} Checking server availability...")
-        retry_count = 0
-        max_retries = 5
+        # Exponential backoff from 50ms: a warm server is found almost at once, while
+        # the later, longer waits still give a cold start ~13s of sleeps (plus at most 1s
+        # per probe). Probes bypass the session so its Retry adapter doesn't stack on top.
+        max_retries = 8
+        delay = 0.05
         
-        while retry_count < max_retries:
+        for attempt in range(max_retries):
             try:
-                response = requests.get(f"{BASE_URL}/ping", timeout=3)
+                response = requests.get(f"{BASE_URL}/ping", timeout=1)
                 if response.status_code == 200:
                     print(f"{EMOJI_SUCCESS} Server is ready and responding")
                     return
@@ -156,9 +333,9 @@ class APIIntegrationTests(unittest.TestCase):
             except requests.RequestException:
                 pass
             
-            print(f"{EMOJI_INFO} Waiting for server to start... (attempt {retry_count+1}/{max_retries})")
-            time.sleep(2)
-            retry_count += 1
+            print(f"{EMOJI_INFO} Waiting for server to start... (attempt {attempt+1}/{max_retries})")
+            time.sleep(delay)
+            delay *= 2
             
         print(f"{EMOJI_FAILURE} Server not available after {max_retries} attempts")
         sys.exit(1)
@@ -166,102 +343,110 @@ class APIIntegrationTests(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """Clean up after all tests"""
-        # Remove test user token
-        redis_client.delete(f"auth_token:{cls.test_token}")
-        print(f"{EMOJI_AUTH} Removed test token for user: {colored(cls.test_username, 'cyan')}")
+        cls._remove_tokens()
+        cls.session.close()
         
-        test_stats.end_time = time.time()
+        test_stats.end_time = time.perf_counter_ns()
         test_stats.print_summary()
     
+    @classmethod
+    def _remove_tokens(cls):
+        """Remove uncached test user tokens in one round trip; safe to call more than once"""
+        if not cls._tokens_to_cleanup:
+            return
+        pipe = redis_client.pipeline(transaction=False)
+        for token in cls._tokens_to_cleanup:
+            pipe.delete(f"auth_token:{token}")
+        pipe.execute()
+        cls._tokens_to_cleanup = []
+        print(f"{EMOJI_AUTH} Removed test token for user: {paint(cls.test_username, 'cyan')}")
+    
     def setUp(self):
         """Setup before each test"""
         self.test_name = self.id().split('.')[-1]
-        self.start_time = time.time()
-        print(f"\n{EMOJI_TEST} Running: {colored(self.test_name, 'cyan')}")
+        self.start_time = time.perf_counter_ns()
+        # Each test's output is collected and written in one go, so concurrent tests don't interleave
+        self.log_lines = []
+        self.log(f"\n{EMOJI_TEST} Running: {paint(self.test_name, 'cyan')}")
     
     def tearDown(self):
         """Cleanup after each test"""
-        duration = time.time() - self.start_time
+        duration = (time.perf_counter_ns() - self.start_time) / 1e9
         result = getattr(self, '_outcome').result
         
-        # Check if test passed
-        if len(result.failures) == 0 and len(result.errors) == 0:
-            for failure in result.failures:
-                if self == failure[0]:
-                    status = "FAIL"
-                    break
-            else:
-                for error in result.errors:
-                    if self == error[0]:
-                        status = "ERROR"
-                        break
-                else:
-                    status = "PASS"
-        else:
-            # Check if this specific test has failed or errored
-            for failure in result.failures:
-                if self == failure[0]:
-                    status = "FAIL"
-                    break
-            else:
-                for error in result.errors:
-                    if self == error[0]:
-                        status = "ERROR"
-                        break
-                else:
-                    status = "PASS"
+        # Failures and errors are both reported as FAIL; subTest failures are recorded against a wrapper
+        failed = any(test is self or getattr(test, 'test_case', None) is self
+                     for test, _ in result.failures + result.errors)
         
-        # Simplified approach to check if the test passed
-        if status == "PASS":
-            print(f"{EMOJI_SUCCESS} {colored('PASSED', 'green')} {self.test_name} in {duration:.3f}s")
+        if failed:
+            self.log(f"{EMOJI_FAILURE} {paint('FAILED', 'red')} {self.test_name} in {duration:.3f}s")
         else:
-            print(f"{EMOJI_FAILURE} {colored('FAILED', 'red')} {self.test_name} in {duration:.3f}s")
+            self.log(f"{EMOJI_SUCCESS} {paint('PASSED', 'green')} {self.test_name} in {duration:.3f}s")
         
-        test_stats.add_result(self.test_name, "PASS" if status == "PASS" else "FAIL", duration)
+        test_stats.add_result(self.test_name, "FAIL" if failed else "PASS", duration)
+        
+        if failed or VERBOSE:
+            with output_lock:
+                sys.stdout.write("\n".join(self.log_lines) + "\n")
+                sys.stdout.flush()
+    
+    def log(self, message):
+        """Queue a line of this test's output; tearDown writes them all at once if the test failed or VERBOSE is set"""
+        self.log_lines.append(message)
     
-    def make_request(self, method, endpoint, headers=None, data=None, expected_status=200, description=None):
-        """Make an HTTP request with informative logging"""
-        url = f"{BASE_URL}{endpoint}"
+    def make_request(self, method, endpoint, headers=None, data=None, expected_status=200, description=None, log=None):
+        """Make an HTTP request with informative logging; log overrides self.log for requests made off-thread"""
+        url = self.urls.get(endpoint) or f"{BASE_URL}{endpoint}"
+        log = log or self.log
         
         if description:
-            print(f"{EMOJI_INFO} {description}")
+            log(f"{EMOJI_INFO} {description}")
         
-        print(f"{EMOJI_API} {method.upper()} {url}")
+        log(f"{EMOJI_API} {method.upper()} {url}")
         
         try:
-            start = time.time()
+            start = time.perf_counter_ns()
             if method.lower() == 'get':
-                response = requests.get(url, headers=headers, timeout=5)
+                response = self.session.get(url, headers=headers, timeout=5)
             elif method.lower() == 'post':
-                response = requests.post(url, headers=headers, data=json.dumps(data) if data else None, timeout=5)
+                response = self.session.post(url, headers=headers, json=data, timeout=5)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
-            duration = time.time() - start
+            duration = (time.perf_counter_ns() - start) / 1e9
             
             status_color = 'green' if response.status_code == expected_status else 'red'
-            print(f"{EMOJI_INFO} Response: HTTP {colored(response.status_code, status_color)} in {duration:.3f}s")
+            log(f"{EMOJI_INFO} Response: HTTP {paint(str(response.status_code), status_color)} in {duration:.3f}s")
             
             return response
         except requests.RequestException as e:
-            print(f"{EMOJI_FAILURE} Request error: {str(e)}")
+            log(f"{EMOJI_FAILURE} Request error: {str(e)}")
             self.fail(f"Request error: {str(e)}")
     
-    def test_ping(self):
-        """Test the ping endpoint"""
-        print(f"{EMOJI_SERVER} Testing server heartbeat...")
-        response = requests.get(f"{BASE_URL}/ping")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["message"], "ok")
-    
-    def test_health(self):
-        """Test the health endpoint"""
-        response = self.make_request('GET', '/health', description="Checking API health status")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn("status", data)
-        print(f"{EMOJI_INFO} Health status: {colored(data['status'], 'green')}")
+    def test_endpoint_probes(self):
+        """GET each ENDPOINT_PROBES entry and check its status and body"""
+        # The probes are independent, so their round trips overlap; each logs to its own
+        # list so the output still reads probe by probe
+        probe_logs = [[] for _ in ENDPOINT_PROBES]
+        with ThreadPoolExecutor(max_workers=len(ENDPOINT_PROBES)) as pool:
+            futures = [pool.submit(self.make_request,
+                                   'GET',
+                                   endpoint,
+                                   headers=self.auth_headers if authenticated else self.headers,
+                                   expected_status=expected_status,
+                                   description=description,
+                                   log=probe_log.append)
+                       for (description, endpoint, authenticated, expected_status, _), probe_log
+                       in zip(ENDPOINT_PROBES, probe_logs)]
+        
+        for (_, endpoint, authenticated, expected_status, check), future, probe_log in zip(
+                ENDPOINT_PROBES, futures, probe_logs):
+            self.log_lines.extend(probe_log)
+            with self.subTest(endpoint=endpoint, authenticated=authenticated):
+                response = future.result()
+                self.assertEqual(response.status_code, expected_status)
+                if check:
+                    check(self, orjson.loads(response.content))
     
     def test_login_endpoint(self):
         """Test the login endpoint"""
@@ -277,9 +462,9 @@ class APIIntegrationTests(unittest.TestCase):
             description="Testing user authentication flow"
         )
         self.assertEqual(response.status_code, 200)
-        data = response.json()
+        data = orjson.loads(response.content)
         self.assertIn("token", data)
-        print(f"{EMOJI_AUTH} Successfully obtained authentication token")
+        self.log(f"{EMOJI_AUTH} Successfully obtained authentication token")
     
     def test_register_endpoint(self):
         """Test the register endpoint"""
@@ -299,40 +484,18 @@ class APIIntegrationTests(unittest.TestCase):
             description=f"Testing user registration for '{test_username}'"
         )
         self.assertEqual(response.status_code, 200)
-        data = response.json()
+        data = orjson.loads(response.content)
         self.assertIn("success", data)
-        print(f"{EMOJI_USER} User '{test_username}' successfully registered")
-    
-    def test_protected_endpoint_with_token(self):
-        """Test accessing a protected endpoint with a valid token"""
-        response = self.make_request(
-            'GET', 
-            '/api/metrics', 
-            headers=self.auth_headers,
-            description="Testing protected endpoint access WITH valid token"
-        )
-        self.assertEqual(response.status_code, 200)
-        print(f"{EMOJI_SECURITY} Protected access successfully granted with valid token")
-    
-    def test_protected_endpoint_without_token(self):
-        """Test accessing a protected endpoint without a token"""
-        response = self.make_request(
-            'GET', 
-            '/api/metrics', 
-            headers=self.headers,
-            expected_status=401,
-            description="Testing protected endpoint access WITHOUT token"
-        )
-        self.assertEqual(response.status_code, 401)
-        print(f"{EMOJI_SECURITY} Protected access correctly denied without token")
+        self.log(f"{EMOJI_USER} User '{test_username}' successfully registered")
     
     def test_query_endpoint(self):
         """Test the query endpoint"""
+        now = int(time.time())
         payload = {
             "query_type": "full",
             "time_range": {
-                "start": int(time.time()) - 86400,  # 1 day ago
-                "end": int(time.time())
+                "start": now - 86400,  # 1 day ago
+                "end": now
             },
             "filters": {},
             "limit": 10,
@@ -346,17 +509,18 @@ class APIIntegrationTests(unittest.TestCase):
             description="Testing standard data query functionality"
         )
         self.assertEqual(response.status_code, 200)
-        data = response.json()
+        data = orjson.loads(response.content)
         self.assertIn("results", data)
-        print(f"{EMOJI_DB} Query returned {colored(len(data['results']), 'cyan')} results")
+        self.log(f"{EMOJI_DB} Query returned {paint(str(len(data['results'])), 'cyan')} results")
     
     def test_secure_query_endpoint(self):
         """Test the secure query endpoint"""
+        now = int(time.time())
         payload = {
             "query_type": "full",
             "time_range": {
-                "start": int(time.time()) - 86400,
-                "end": int(time.time())
+                "start": now - 86400,
+                "end": now
             },
             "query_filters": {},
             "fields_to_redact": getattr(config, "REDACT_FIELDS", ["pii", "sensitive"]),
@@ -372,48 +536,22 @@ class APIIntegrationTests(unittest.TestCase):
             description="Testing privacy-enhanced secure query"
         )
         self.assertEqual(response.status_code, 200)
-        data = response.json()
+        data = orjson.loads(response.content)
         self.assertIn("results", data)
-        print(f"{EMOJI_PRIVACY} Secure query returned privacy-protected data")
-    
-    def test_privacy_health_endpoint(self):
-        """Test the privacy services health endpoint"""
-        response = self.make_request(
-            'GET', 
-            '/api/privacy-services/health',
-            description="Checking privacy services health"
-        )
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["status"], "healthy")
-        print(f"{EMOJI_PRIVACY} Privacy services status: {colored(data['status'], 'green')}")
-    
-    def test_user_info_endpoint(self):
-        """Test getting user info with valid token"""
-        response = self.make_request(
-            'GET', 
-            f'/api/users/{self.test_username}', 
-            headers=self.auth_headers,
-            description=f"Retrieving user profile for '{self.test_username}'"
-        )
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["username"], self.test_username)
-        print(f"{EMOJI_USER} Successfully retrieved user profile")
+        self.log(f"{EMOJI_PRIVACY} Secure query returned privacy-protected data")
     
-    def test_metrics_endpoint(self):
-        """Test the metrics endpoint"""
-        response = self.make_request(
-            'GET', 
-            '/api/metrics', 
-            headers=self.auth_headers,
-            description="Retrieving system metrics"
-        )
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn("metrics", data)
-        print(f"{EMOJI_TIME} Successfully retrieved {colored(len(data['metrics']), 'cyan')} metrics")
-
 if __name__ == "__main__":
-    print(f"\n{EMOJI_ROCKET} {colored('Launching API Integration Tests', 'magenta', attrs=['bold'])}")
-    unittest.main(verbosity=0)
\ No newline at end of file
+    print(f"\n{EMOJI_ROCKET} {paint('Launching API Integration Tests', 'magenta', True)}")
+    # -k PATTERN (repeatable) reruns just the matching tests, like unittest's own -k
+    parser = argparse.ArgumentParser(description="Run the API integration tests")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Print every test's log, not just failures")
+    parser.add_argument('-k', dest='patterns', action='append', help="Only run tests whose name contains PATTERN")
+    args = parser.parse_args()
+    VERBOSE = VERBOSE or args.verbose
+    
+    loader = unittest.TestLoader()
+    if args.patterns:
+        loader.testNamePatterns = [f"*{pattern}*" for pattern in args.patterns]
+    suite = ConcurrentTestSuite(loader.loadTestsFromTestCase(APIIntegrationTests))
+    result = unittest.TextTestRunner(verbosity=0, resultclass=LockedTextTestResult).run(suite)
+    sys.exit(not result.wasSuccessful())
\ No newline at end of file
@@ -3,88 +3,258 @@
 
 import argparse
 import hashlib
+import json
+import os
 import re
 import requests
 import sys
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 
-def get_entity_hash(entity, salt):
-    """Generate consistent hash for an entity."""
-    return hashlib.sha256(f"{entity}{salt}".encode()).hexdigest()[:8]
+try:
+    import orjson
+except ImportError:  # The redactor also runs without the API server's requirements
+    orjson = None
 
-def mark_entities_with_ollama(text, model="llama3"):
-    """Ask Ollama to mark named entities in text."""
-    prompt = f"""Mark all proper names (people, organizations, places) with <E> tags.
+OLLAMA_URL = "http://localhost:11434"
+OLLAMA_KEEP_ALIVE = "10m"
+CHUNK_CHARS = 1500  # Per-request text size; documents are split on sentence ends
+# Concurrent chunk requests; matching the server's OLLAMA_NUM_PARALLEL keeps every Ollama slot busy
+OLLAMA_WORKERS = int(os.environ.get("OLLAMA_NUM_PARALLEL") or 4)
+
+# One keep-alive pool for every request to Ollama
+_ollama = requests.Session()
+_ollama.mount(OLLAMA_URL, HTTPAdapter(pool_connections=1, pool_maxsize=OLLAMA_WORKERS))
+
+PROMPT_PREFIX = """Mark all proper names (people, organizations, places) with <E> tags.
 Return the same text with only tags added.
 
 Example: John Smith works at Google → <E>John Smith</E> works at <E>Google</E>
 
-Text: {text}"""
+Text: """
+
+# Read once at import, while single-threaded: os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_SENTENCE_END = re.compile(r'[.!?]\s+')
+# DOTALL so a name the model marked across a line break is still redacted
+_ENTITY_RE = re.compile(r'<E>(.*?)</E>', re.DOTALL)
+
+@lru_cache(maxsize=4096)
+def get_entity_hash(entity, salt, algo="blake2b"):
+    """Generate consistent hash for an entity; algo="sha256" reproduces tags from older runs."""
+    if algo == "sha256":
+        return hashlib.sha256(f"{entity}{salt}".encode()).hexdigest()[:8]
+    # Keyed BLAKE2b yields the 8 hex chars directly; salts over the 64-byte key limit are hashed down
+    key = salt.encode()
+    if len(key) > 64:
+        key = hashlib.blake2b(key).digest()
+    return hashlib.blake2b(entity.encode(), digest_size=4, key=key).hexdigest()
+
+def request_marked_text(text, model="llama3"):
+    """Ask Ollama to mark named entities in text; raises if Ollama fails."""
+    # keep_alive keeps the model loaded between chunks and back-to-back runs instead of reloading it
+    payload = {"model": model, "prompt": PROMPT_PREFIX + text, "stream": True, "keep_alive": OLLAMA_KEEP_ALIVE}
+    if orjson:
+        body = {"data": orjson.dumps(payload), "headers": {"Content-Type": "application/json"}}
+    else:
+        body = {"json": payload}
+    
+    # Streamed, the 30s timeout applies between tokens rather than to the whole generation
+    with _ollama.post(
+        f"{OLLAMA_URL}/api/generate",
+        stream=True,
+        timeout=30,
+        **body
+    ) as response:
+        pieces = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            part = orjson.loads(line) if orjson else json.loads(line)
+            if "error" in part:
+                raise RuntimeError(part["error"])
+            pieces.append(part.get("response", ""))
+    return "".join(pieces)
+
+def mark_entities_with_ollama(text, model="llama3", cache_dir=None):
+    """Ask Ollama to mark named entities in text, reusing earlier answers from cache_dir if given."""
+    cache_path = None
+    if cache_dir is not None:
+        # Keyed on everything that shapes the answer, so a new model or prompt never hits old entries
+        key = hashlib.blake2b(f"{model}\0{PROMPT_PREFIX}{text}".encode(), digest_size=16).hexdigest()
+        cache_path = Path(cache_dir) / f"{key}.txt"
+        try:
+            cached = cache_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            cached = None
+        # An empty entry can only be a leftover from a failed write; treat it as a miss
+        if cached:
+            return cached
     
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": model, "prompt": prompt, "stream": False},
-            timeout=30
-        )
-        return response.json().get("response", text)
+        marked = request_marked_text(text, model)
     except:
         print("Warning: Ollama unavailable, returning original text", file=sys.stderr)
         return text
-
-def redact_document(input_path, output_path, salt, model="llama3"):
-    """Redact named entities in a document."""
-    # Read input
-    text = Path(input_path).read_text(encoding='utf-8')
     
-    # Get marked text from Ollama
-    marked = mark_entities_with_ollama(text, model)
-    
-    # Replace marked entities with hashes
-    entity_map = {}
-    def replace_entity(match):
-        entity = match.group(1)
-        if entity not in entity_map:
-            entity_map[entity] = f"[REDACTED_{get_entity_hash(entity, salt)}]"
-        return entity_map[entity]
-    
-    redacted = re.sub(r'<E>(.*?)</E>', replace_entity, marked)
+    # Only real answers are cached, never the unmarked fallback above
+    if cache_path is not None:
+        write_cache_entry(cache_path, marked)
+    return marked
+
+def write_cache_entry(cache_path, marked):
+    """Write a cache entry via a private temp file and an atomic rename, so readers never see a partial one."""
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(marked)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+def split_into_chunks(text, size=CHUNK_CHARS):
+    """Split text into pieces of about size characters, cutting only after sentence ends."""
+    chunks, start, prev = [], 0, 0
+    for match in _SENTENCE_END.finditer(text):
+        if match.end() - start > size and prev > start:
+            chunks.append(text[start:prev])
+            start = prev
+        prev = match.end()
+    chunks.append(text[start:])
+    return chunks
+
+def read_chunks(path, size=CHUNK_CHARS):
+    """Yield a file's text in split_into_chunks pieces without reading the whole file at once."""
+    with open(path, encoding='utf-8') as f:
+        pending = ""
+        for line in f:
+            pending += line
+            if len(pending) > size:
+                chunks = split_into_chunks(pending, size)
+                # The last piece may still run on into the next lines, unless it has no sentence end in sight
+                if len(chunks[-1]) > 4 * size:
+                    yield from chunks
+                    pending = ""
+                else:
+                    yield from chunks[:-1]
+                    pending = chunks[-1]
+        yield pending
+
+def ordered_map(pool, fn, items, window):
+    """Like pool.map, but pulls items lazily and keeps at most window calls in flight."""
+    in_flight = deque()
+    for item in items:
+        in_flight.append(pool.submit(fn, item))
+        if len(in_flight) >= window:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+def mark_chunk(chunk, model="llama3", cache_dir=None):
+    """Mark entities in one chunk, keeping its surrounding whitespace so chunks rejoin exactly."""
+    body = chunk.strip()
+    if not body:
+        return chunk
+    lead = chunk[:len(chunk) - len(chunk.lstrip())]
+    trail = chunk[len(chunk.rstrip()):]
+    return lead + mark_entities_with_ollama(body, model, cache_dir) + trail
+
+def redact_documents(jobs, salt, model="llama3", hash_algo="blake2b", cache_dir=None):
+    """Redact named entities in several (input_path, output_path) documents; returns entity counts."""
+    if cache_dir is not None:
+        Path(cache_dir).mkdir(mode=0o700, parents=True, exist_ok=True)
     
-    # Write output
-    Path(output_path).write_text(redacted, encoding='utf-8')
+    counts = []
+    with ThreadPoolExecutor(max_workers=OLLAMA_WORKERS) as pool:
+        for input_path, output_path in jobs:
+            # Replace marked entities with hashes; tags never span chunks, each is marked on its own
+            entity_map = {}
+            def replace_entity(match):
+                entity = match.group(1)
+                replacement = entity_map.get(entity)
+                if replacement is None:
+                    replacement = entity_map[entity] = f"[REDACTED_{get_entity_hash(entity, salt, hash_algo)}]"
+                return replacement
+            
+            # Read, mark and write chunk by chunk: Ollama sees short prompts that run side by side,
+            # each comes back in order as it finishes, and only a few chunks are ever held in memory.
+            # Output goes to a temp file that replaces the target only once the document is done,
+            # so in-place redaction still reads the original and a failure leaves no partial file.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)),
+                                            prefix=".redact-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                    for marked in ordered_map(pool, lambda chunk: mark_chunk(chunk, model, cache_dir),
+                                              read_chunks(input_path), 2 * OLLAMA_WORKERS):
+                        out.write(_ENTITY_RE.sub(replace_entity, marked))
+                os.chmod(tmp_path, 0o666 & ~_UMASK)  # mkstemp creates 0600; match a plain open()
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            counts.append(len(entity_map))
     
-    return len(entity_map)
+    return counts
+
+def redact_document(input_path, output_path, salt, model="llama3", hash_algo="blake2b", cache_dir=None):
+    """Redact named entities in a document."""
+    return redact_documents([(input_path, output_path)], salt, model, hash_algo, cache_dir)[0]
 
 def main():
     parser = argparse.ArgumentParser(description="Redact named entities using Ollama")
-    parser.add_argument("input", help="Input document")
-    parser.add_argument("-o", "--output", help="Output document (default: input_redacted)")
+    parser.add_argument("inputs", nargs="+", help="Input document(s)")
+    parser.add_argument("-o", "--output", help="Output document, single input only (default: input_redacted)")
     parser.add_argument("-s", "--salt", required=True, help="Secret salt for hashing")
     parser.add_argument("-m", "--model", default="llama3", help="Ollama model (default: llama3)")
+    parser.add_argument("--hash-algo", choices=["blake2b", "sha256"], default="blake2b",
+                        help="Entity tag hash; sha256 matches tags from older runs (default: blake2b)")
+    parser.add_argument("--cache-dir", help="Reuse Ollama answers for unchanged text across runs; "
+                                            "entries hold the original, unredacted text")
     
     args = parser.parse_args()
     
-    # Set default output path
-    if not args.output:
-        p = Path(args.input)
-        args.output = p.with_name(f"{p.stem}_redacted{p.suffix}")
-    
-    # Check input exists
-    if not Path(args.input).exists():
-        print(f"Error: Input file '{args.input}' not found", file=sys.stderr)
+    if args.output and len(args.inputs) > 1:
+        print("Error: --output can only be used with a single input", file=sys.stderr)
         return 1
     
+    # Check inputs exist
+    for input_path in args.inputs:
+        if not Path(input_path).exists():
+            print(f"Error: Input file '{input_path}' not found", file=sys.stderr)
+            return 1
+    
+    # Set default output paths
+    jobs = []
+    for input_path in args.inputs:
+        p = Path(input_path)
+        jobs.append((input_path, args.output or p.with_name(f"{p.stem}_redacted{p.suffix}")))
+    
     # Check Ollama is running
     try:
-        requests.get("http://localhost:11434/api/tags", timeout=2)
+        _ollama.get(f"{OLLAMA_URL}/api/tags", timeout=2)
     except:
         print("Error: Ollama not running. Start with: ollama serve", file=sys.stderr)
         return 1
     
-    # Redact document
+    # Redact documents
     try:
-        count = redact_document(args.input, args.output, args.salt, args.model)
-        print(f"Redacted {count} unique entities → {args.output}")
+        counts = redact_documents(jobs, args.salt, args.model, args.hash_algo, args.cache_dir)
+        for (_, output_path), count in zip(jobs, counts):
+            print(f"Redacted {count} unique entities → {output_path}")
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -1,40 +1,50 @@
 from agency_config import api_urls
-import requests
+import asyncio
+import aiohttp
 import string
-import time
 import re
 
+MAX_IN_FLIGHT = 8
+
+# First href on each line that contains field--name-field-website, found in one pass over the page
+WEBSITE_HREF_RE = re.compile(r'^(?=.*field--name-field-website)[^\n]*?href=["\'](.*?)["\']', re.MULTILINE)
+
+async def fetch_page(session, semaphore, url):
+    """Fetch one index page; returns its HTML, or None if the request failed"""
+    async with semaphore:
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                resp.raise_for_status()  # Raise exception for bad status codes
+                return await resp.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
 # Function to scrape raw HTML and print URLs from lines with field--name-field-website
-def scrape_agency_urls():
+async def scrape_agency_urls():
     base_url = "https://www.usa.gov/agency-index"
-    
-    # Iterate through A-Z
-    for letter in string.ascii_lowercase:
-        try:
-            # Fetch page for each letter (e.g., /agency-index/a)
-            if letter == "a":
-                response = requests.get(f"{base_url}#A", timeout=10)
-            else:
-                response = requests.get(f"{base_url}/{letter}", timeout=10)
-            response.raise_for_status()  # Raise exception for bad status codes
-            
-            # Split the raw HTML into lines
-            html_lines = response.text.splitlines()
-            
-            # Process lines containing field--name-field-website
-            for line in html_lines:
-                if "field--name-field-website" in line:
-                    # Extract URL using regex
-                    match = re.search(r'href=["\'](.*?)["\']', line)
-                    if match:
-                        url = match.group(1)
-                        print(url.strip())
-                            
-        except requests.RequestException as e:
+
+    # Page for each letter (e.g., /agency-index/a); A is the index page itself
+    urls = [f"{base_url}#A" if letter == "a" else f"{base_url}/{letter}"
+            for letter in string.ascii_lowercase]
+
+    # Fetch all 26 pages at once over a small pool, so wall time is about the slowest page
+    semaphore = asyncio.Semaphore(MAX_IN_FLIGHT)
+    connector = aiohttp.TCPConnector(limit=MAX_IN_FLIGHT)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        pages = await asyncio.gather(*[fetch_page(session, semaphore, url) for url in urls])
+
+    # Pages come back in A-Z order, so output order is unchanged
+    seen = set()
+    for html in pages:
+        if html is None:
             continue
-        
-        # Add a small delay to avoid overwhelming the server
-        time.sleep(0.5)
+
+        # Extract URLs from lines containing field--name-field-website, printing each only once
+        for match in WEBSITE_HREF_RE.finditer(html):
+            url = match.group(1).strip()
+            if url not in seen:
+                seen.add(url)
+                print(url)
 
 # Run the scraper
-scrape_agency_urls()
+asyncio.run(scrape_agency_urls())
@@ -2,24 +2,47 @@
 Utility functions for the API server
 """
 
+import os
 import redis
 import hashlib
 import secrets
 import bcrypt
 import config
 import time
-import json
+import orjson
+from cachetools import TTLCache
 from typing import Dict, Any, Optional, Tuple
 
-# Initialize Redis client
+# Initialize Redis client on an explicit, shared connection pool
 try:
-    redis_client = redis.Redis(
-        host=getattr(config, 'REDIS_HOST', 'localhost'),
-        port=getattr(config, 'REDIS_PORT', 6379),
+    # Prefer a UNIX socket when Redis is co-located; otherwise TCP with keepalive
+    redis_socket = getattr(config, 'REDIS_SOCKET', None)
+    if redis_socket:
+        redis_connection_kwargs = {
+            'connection_class': redis.UnixDomainSocketConnection,
+            'path': redis_socket
+        }
+    else:
+        redis_connection_kwargs = {
+            'host': getattr(config, 'REDIS_HOST', 'localhost'),
+            'port': getattr(config, 'REDIS_PORT', 6379),
+            'socket_keepalive': True
+        }
+    
+    # Blocking pool: callers wait for a free connection instead of erroring when it is exhausted
+    redis_pool = redis.BlockingConnectionPool(
+        max_connections=getattr(config, 'REDIS_MAX_CONNECTIONS', 256),
+        timeout=getattr(config, 'REDIS_POOL_TIMEOUT', 5),
         db=getattr(config, 'REDIS_DB', 0),
         password=getattr(config, 'REDIS_PASSWORD', None),
-        decode_responses=True
+        decode_responses=True,
+        health_check_interval=30,
+        # Shows up in CLIENT LIST; gunicorn_conf.post_fork renames it per worker, since
+        # under preload_app this import runs in the master
+        client_name=f"naraapi-{os.getpid()}",
+        **redis_connection_kwargs
     )
+    redis_client = redis.Redis(connection_pool=redis_pool)
     redis_client.ping()  # Test connection
 except redis.ConnectionError as e:
     print(f"Warning: Redis connection failed: {e}")
@@ -46,20 +69,76 @@ except redis.ConnectionError as e:
         def expire(self, key, time):
             return True
             
+        def xadd(self, name, fields, maxlen=None, approximate=True):
+            stream = self.data.setdefault(name, [])
+            stream.append(fields)
+            if maxlen is not None and len(stream) > maxlen:
+                del stream[:len(stream) - maxlen]
+            return str(len(stream))
+            
         def rpush(self, key, value):
-            if key not in self.data:
-                self.data[key] = []
-            self.data[key].append(value)
-            return len(self.data[key])
+            items = self.data.setdefault(key, [])
+            items.append(value)
+            return len(items)
             
         def lrange(self, key, start, end):
-            if key not in self.data:
-                return []
-            return self.data[key][start:end if end != -1 else None]
+            # Redis ranges include end, and -1 means the last element
+            return self.data.get(key, [])[start:end + 1 if end != -1 else None]
+            
+        def pipeline(self, transaction=True):
+            return MockPipeline(self)
+    
+    class MockPipeline:
+        """Queues commands and runs them against MockRedis on execute()"""
+        def __init__(self, client):
+            self.client = client
+            self.commands = []
+            
+        def __getattr__(self, name):
+            method = getattr(self.client, name)
+            def queued(*args, **kwargs):
+                self.commands.append((method, args, kwargs))
+                return self
+            return queued
+            
+        def execute(self):
+            results = [method(*args, **kwargs) for method, args, kwargs in self.commands]
+            self.commands = []
+            return results
     
     print("Using mock Redis client for development")
     redis_client = MockRedis()
 
+# In-process cache of token -> username lookups, keyed by token digest.
+# The short TTL bounds how long a token revoked by another worker stays usable.
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+# Negative cache so floods of bad tokens don't each hit Redis
+_invalid_token_cache = TTLCache(maxsize=10000, ttl=5)
+
+_AUTH_TOKEN_PREFIX = b"auth_token:"
+
+def _token_digest(token_bytes: bytes) -> bytes:
+    return hashlib.sha256(token_bytes).digest()
+
+def _auth_token_key(token_bytes: bytes) -> bytes:
+    """Redis key for a token; redis-py sends bytes keys without re-encoding them"""
+    return _AUTH_TOKEN_PREFIX + token_bytes
+
+def _run_off_hub(func, *args):
+    """
+    Run a blocking C call on gevent's native thread pool when the worker is monkey-patched
+    
+    bcrypt releases the GIL but knows nothing about greenlets, so called inline it stalls
+    every request on the worker for the whole hash. Without gevent this is a plain call.
+    """
+    try:
+        from gevent import get_hub, monkey
+    except ImportError:
+        return func(*args)
+    if not monkey.is_module_patched('socket'):
+        return func(*args)
+    return get_hub().threadpool.apply(func, args)
+
 def hash_password(password: str) -> str:
     """
     Hash a password using bcrypt
@@ -70,9 +149,9 @@ def hash_password(password: str) -> str:
     Returns:
     - Hashed password
     """
-    # Generate a salt and hash the password
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode(), salt)
+    # Generate a salt and hash the password; BCRYPT_ROUNDS lets staging use a cheaper cost
+    salt = bcrypt.gensalt(rounds=getattr(config, 'BCRYPT_ROUNDS', 12))
+    hashed = _run_off_hub(bcrypt.hashpw, password.encode(), salt)
     return hashed.decode()
 
 def verify_password(stored_password: str, provided_password: str) -> bool:
@@ -87,7 +166,7 @@ def verify_password(stored_password: str, provided_password: str) -> bool:
     - True if password matches, False otherwise
     """
     try:
-        return bcrypt.checkpw(provided_password.encode(), stored_password.encode())
+        return _run_off_hub(bcrypt.checkpw, provided_password.encode(), stored_password.encode())
     except Exception:
         return False
 
@@ -113,19 +192,52 @@ def store_token(username: str, token: str, expires_in: int = 86400) -> bool:
     - True if successful, False otherwise
     """
     try:
+        # All three writes go out in one round trip
+        pipe = redis_client.pipeline(transaction=False)
+        
         # Store token -> username mapping
-        redis_client.set(f"auth_token:{token}", username, ex=expires_in)
+        pipe.set(_auth_token_key(token.encode()), username, ex=expires_in)
         
         # Store username -> tokens mapping for potential revocation
         user_tokens_key = f"user_tokens:{username}"
-        redis_client.rpush(user_tokens_key, token)
-        redis_client.expire(user_tokens_key, expires_in * 2)  # Longer expiry for user tracking
+        pipe.rpush(user_tokens_key, token)
+        pipe.expire(user_tokens_key, expires_in * 2)  # Longer expiry for user tracking
         
+        pipe.execute()
+        # A lookup in the last few seconds may have cached this token as unknown
+        _invalid_token_cache.pop(_token_digest(token.encode()), None)
         return True
     except Exception as e:
         print(f"Error storing token: {e}")
         return False
 
+def resolve_token(token: str) -> Optional[str]:
+    """
+    Resolve an auth token to its username, using the in-process cache
+    
+    Parameters:
+    - token: The token to resolve
+    
+    Returns:
+    - Username if the token is valid, None otherwise
+    """
+    # Encode once for both the cache digest and the Redis key
+    token_bytes = token.encode()
+    digest = _token_digest(token_bytes)
+    username = _token_cache.get(digest)
+    if username is not None:
+        return username
+    if digest in _invalid_token_cache:
+        return None
+    
+    username = redis_client.get(_auth_token_key(token_bytes))
+    if not username:
+        _invalid_token_cache[digest] = True
+        return None
+    
+    _token_cache[digest] = username
+    return username
+
 def revoke_token(token: str) -> bool:
     """
     Revoke a token
@@ -138,12 +250,15 @@ def revoke_token(token: str) -> bool:
     """
     try:
         # Get username associated with token
-        username = redis_client.get(f"auth_token:{token}")
+        token_bytes = token.encode()
+        key = _auth_token_key(token_bytes)
+        username = redis_client.get(key)
         if not username:
             return False
             
         # Delete token
-        redis_client.delete(f"auth_token:{token}")
+        redis_client.delete(key)
+        _token_cache.pop(_token_digest(token_bytes), None)
         
         return True
     except Exception as e:
@@ -165,12 +280,14 @@ def revoke_all_user_tokens(username: str) -> bool:
         user_tokens_key = f"user_tokens:{username}"
         tokens = redis_client.lrange(user_tokens_key, 0, -1)
         
-        # Delete each token
+        # Delete each token and the user's token list in one round trip
+        pipe = redis_client.pipeline(transaction=False)
         for token in tokens:
-            redis_client.delete(f"auth_token:{token}")
-            
-        # Delete the user's token list
-        redis_client.delete(user_tokens_key)
+            token_bytes = token.encode()
+            pipe.delete(_auth_token_key(token_bytes))
+            _token_cache.pop(_token_digest(token_bytes), None)
+        pipe.delete(user_tokens_key)
+        pipe.execute()
         
         return True
     except Exception as e:
@@ -197,10 +314,12 @@ def log_activity(username: str, action: str, details: Dict[str, Any] = None) ->
             'details': details or {}
         }
         
-        # Store in Redis list with auto-expiry (30 days)
+        # Store in Redis list with auto-expiry (30 days), both in one round trip
         key = f"activity_log:{username}:{time.strftime('%Y-%m')}"
-        redis_client.rpush(key, json.dumps(log_entry))
-        redis_client.expire(key, 30 * 24 * 60 * 60)  # 30 days in seconds
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.rpush(key, orjson.dumps(log_entry, option=orjson.OPT_NON_STR_KEYS))
+        pipe.expire(key, 30 * 24 * 60 * 60)  # 30 days in seconds
+        pipe.execute()
         
         return True
     except Exception as e:
@@ -0,0 +1,11 @@
+"""
+WSGI entry point for running the API server under gunicorn with gevent workers
+
+    gunicorn -c gunicorn_conf.py wsgi:application
+"""
+
+# Patch sockets before redis/requests are imported so their I/O yields cooperatively
+from gevent import monkey
+monkey.patch_all()
+
+from api_server import application